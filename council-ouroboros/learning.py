@@ -19,22 +19,30 @@ WINDOW = int(os.getenv("LEARNING_WINDOW", "50"))
 class VoterHistory:
     name: str
     pass_rate: deque = field(default_factory=lambda: deque(maxlen=WINDOW))
+    # running count of passes in the window; samples are 0/1 so this is
+    # both the sum and the sum of squares
+    _passes: int = field(default=0, repr=False)
 
     def push(self, passed: bool) -> None:
+        if self.pass_rate and len(self.pass_rate) == self.pass_rate.maxlen:
+            self._passes -= int(self.pass_rate[0])
         self.pass_rate.append(1.0 if passed else 0.0)
+        self._passes += bool(passed)
 
     def mean(self) -> float:
-        return sum(self.pass_rate) / len(self.pass_rate) if self.pass_rate else 0.0
+        return self._passes / len(self.pass_rate) if self.pass_rate else 0.0
 
     def std(self) -> float:
-        m = self.mean()
-        if len(self.pass_rate) < 2: return 0.0
-        var = sum((x - m) ** 2 for x in self.pass_rate) / (len(self.pass_rate) - 1)
-        return math.sqrt(var)
+        n = len(self.pass_rate)
+        if n < 2: return 0.0
+        p = self._passes
+        var = (p - p * p / n) / (n - 1)
+        return math.sqrt(max(var, 0.0))
 
     def zscore_last(self) -> float:
-        if not self.pass_rate or self.std() == 0: return 0.0
-        return (self.pass_rate[-1] - self.mean()) / self.std()
+        sd = self.std()
+        if not self.pass_rate or sd == 0: return 0.0
+        return (self.pass_rate[-1] - self.mean()) / sd
 
 HISTORY: dict[str, VoterHistory] = {}
 
@@ -21,6 +21,7 @@ class Metrics:
     veto_count: int = 0
     voter_latency_ms: dict = field(default_factory=dict)
     started_at: float = field(default_factory=time.time)
+    started_mono: float = field(default_factory=time.monotonic)
 
 METRICS = Metrics()
 
@@ -46,7 +47,7 @@ def prometheus_text() -> str:
         f"council_drafts_total {METRICS.draft_count}",
         f"council_vetos_total {METRICS.veto_count}",
         f"council_veto_rate {veto_rate():.4f}",
-        f"council_uptime_seconds {time.time() - METRICS.started_at:.0f}",
+        f"council_uptime_seconds {time.monotonic() - METRICS.started_mono:.0f}",
     ]
     for v, ms in METRICS.voter_latency_ms.items():
         lines.append(f'council_voter_latency_ms{{voter="{v}"}} {ms:.2f}')
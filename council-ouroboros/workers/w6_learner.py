@@ -8,6 +8,7 @@ Persists embeddings to Chroma; tabular metrics to Postgres.
 """
 from __future__ import annotations
 import os, logging
+from collections import Counter, defaultdict
 from dataclasses import dataclass
 
 log = logging.getLogger("w6_learner")
@@ -24,13 +25,14 @@ class LearningUpdate:
 def learn(audit_reports: list[dict], voter_outputs: list[dict]) -> list[LearningUpdate]:
     """Reward voters whose drafts pass audit; penalize those whose drafts veto."""
     updates: list[LearningUpdate] = []
-    veto_voters: dict[str, int] = {}
-    pass_voters: dict[str, int] = {}
+    voters_by_draft: dict[str, list[str]] = defaultdict(list)
+    for v in voter_outputs:
+        voters_by_draft[v.get("draft_id")].append(v["voter"])
+    veto_voters: Counter[str] = Counter()
+    pass_voters: Counter[str] = Counter()
     for r in audit_reports:
         bucket = veto_voters if r.get("auditor_veto") else pass_voters
-        for v in voter_outputs:
-            if v.get("draft_id") == r.get("draft_id"):
-                bucket[v["voter"]] = bucket.get(v["voter"], 0) + 1
+        bucket.update(voters_by_draft.get(r.get("draft_id"), ()))
     for v, n in pass_voters.items():
         updates.append(LearningUpdate(v, +LR * n, f"{n} drafts passed audit"))
     for v, n in veto_voters.items():
@@ -3,6 +3,12 @@ from fastapi.responses import HTMLResponse
 from datetime import datetime
 import json
 
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as FastJSONResponse
+
 app = FastAPI(title="ARK95X AI Engineer Ignition")
 
 ROADMAP = {
@@ -14,24 +20,32 @@ ROADMAP = {
     "month_6": {"title": "Real-World Engineering", "status": "pending", "topics": ["Portfolio projects", "System design", "Production deployment", "Monitoring", "Scale architecture"]},
 }
 
-@app.get("/", response_class=HTMLResponse)
-async def home():
-    html = "<html><head><title>ARK95X AI Engineer Roadmap</title>"
-    html += "<style>body{background:#0d1117;color:#c9d1d9;font-family:monospace;padding:20px;}"
-    html += ".complete{color:#3fb950;} .active{color:#d29922;} .pending{color:#8b949e;}"
-    html += "h1{color:#58a6ff;} .card{border:1px solid #30363d;padding:15px;margin:10px 0;border-radius:6px;}</style></head><body>"
-    html += "<h1>ARK95X — Zero to AI Engineer in 6 Months</h1>"
-    html += f"<p>Pipeline active | Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}</p>"
+def _render_home() -> str:
+    parts = [
+        "<html><head><title>ARK95X AI Engineer Roadmap</title>",
+        "<style>body{background:#0d1117;color:#c9d1d9;font-family:monospace;padding:20px;}",
+        ".complete{color:#3fb950;} .active{color:#d29922;} .pending{color:#8b949e;}",
+        "h1{color:#58a6ff;} .card{border:1px solid #30363d;padding:15px;margin:10px 0;border-radius:6px;}</style></head><body>",
+        "<h1>ARK95X — Zero to AI Engineer in 6 Months</h1>",
+        "<p>Pipeline active | Last updated: {TIMESTAMP}</p>",
+    ]
     for key, month in ROADMAP.items():
         status_class = month['status']
         icon = '✓' if status_class == 'complete' else '→' if status_class == 'active' else '○'
-        html += f"<div class='card'><h3 class='{status_class}'>{icon} {month['title']}</h3>"
-        html += "<ul>" + "".join(f"<li>{t}</li>" for t in month['topics']) + "</ul></div>"
-    html += "<p>Progress tracked in Legacy Vault. Data pipelines routed through Neuro-Nura.</p>"
-    html += "</body></html>"
-    return html
+        parts.append(f"<div class='card'><h3 class='{status_class}'>{icon} {month['title']}</h3>")
+        parts.append("<ul>" + "".join(f"<li>{t}</li>" for t in month['topics']) + "</ul></div>")
+    parts.append("<p>Progress tracked in Legacy Vault. Data pipelines routed through Neuro-Nura.</p>")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+# ROADMAP is static, so the page is rendered once; only the timestamp varies per request
+_HOME_TEMPLATE = _render_home()
+
+@app.get("/", response_class=HTMLResponse)
+async def home():
+    return _HOME_TEMPLATE.replace("{TIMESTAMP}", datetime.now().strftime('%Y-%m-%d %H:%M'))
 
-@app.get("/api/roadmap")
+@app.get("/api/roadmap", response_class=FastJSONResponse)
 async def roadmap_api():
     return {"roadmap": ROADMAP, "generated": datetime.now().isoformat(), "version": "v3.0"}
 
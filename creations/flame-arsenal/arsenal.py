@@ -1,6 +1,7 @@
 from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from datetime import datetime
+import json
 
 app = FastAPI(title="FLAME ARSENAL - Ethical Hacking Educational Toolkit")
 
@@ -118,27 +119,40 @@ ARSENAL = {
     },
 }
 
-@app.get("/", response_class=HTMLResponse)
-async def home():
-    total = sum(len(cat["commands"]) for cat in ARSENAL.values())
-    html = "<html><head><title>FLAME ARSENAL</title>"
-    html += "<style>body{background:#0d1117;color:#c9d1d9;font-family:monospace;padding:20px;}"
-    html += "h1{color:#f85149;} h3{color:#d29922;} table{border-collapse:collapse;width:100%;}"
-    html += "td,th{border:1px solid #30363d;padding:8px;text-align:left;} th{background:#161b22;}</style></head><body>"
-    html += f"<h1>FLAME ARSENAL - {total} Ethical Hacking Commands</h1>"
-    html += "<p>Educational use ONLY. HexSec sourced. Sentinel locked. Lineage protected.</p>"
+TOTAL_COMMANDS = sum(len(cat["commands"]) for cat in ARSENAL.values())
+
+def _render_home() -> str:
+    parts = [
+        "<html><head><title>FLAME ARSENAL</title>",
+        "<style>body{background:#0d1117;color:#c9d1d9;font-family:monospace;padding:20px;}",
+        "h1{color:#f85149;} h3{color:#d29922;} table{border-collapse:collapse;width:100%;}",
+        "td,th{border:1px solid #30363d;padding:8px;text-align:left;} th{background:#161b22;}</style></head><body>",
+        f"<h1>FLAME ARSENAL - {TOTAL_COMMANDS} Ethical Hacking Commands</h1>",
+        "<p>Educational use ONLY. HexSec sourced. Sentinel locked. Lineage protected.</p>",
+    ]
     for key, cat in ARSENAL.items():
-        html += f"<h3>{cat['category']}</h3><table><tr><th>Command</th><th>Purpose</th></tr>"
+        parts.append(f"<h3>{cat['category']}</h3><table><tr><th>Command</th><th>Purpose</th></tr>")
         for cmd in cat["commands"]:
-            html += f"<tr><td><code>{cmd['cmd']}</code></td><td>{cmd['use']}</td></tr>"
-        html += "</table>"
-    html += "</body></html>"
-    return html
+            parts.append(f"<tr><td><code>{cmd['cmd']}</code></td><td>{cmd['use']}</td></tr>")
+        parts.append("</table>")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+# ARSENAL is static, so the page is rendered and encoded once at import
+_HOME_HTML = _render_home().encode("utf-8")
+
+@app.get("/", response_class=HTMLResponse)
+async def home():
+    return HTMLResponse(content=_HOME_HTML)
+
+_ARSENAL_JSON = json.dumps(
+    {"status": "IGNITED", "total_commands": TOTAL_COMMANDS, "categories": list(ARSENAL.keys()), "note": "Educational use ONLY. Sentinel locked."},
+    ensure_ascii=False, separators=(",", ":"),
+).encode("utf-8")
 
 @app.get("/api/arsenal")
 async def arsenal_api():
-    total = sum(len(cat["commands"]) for cat in ARSENAL.values())
-    return {"status": "IGNITED", "total_commands": total, "categories": list(ARSENAL.keys()), "note": "Educational use ONLY. Sentinel locked."}
+    return Response(content=_ARSENAL_JSON, media_type="application/json")
 
 @app.get("/api/category/{cat}")
 async def category(cat: str):
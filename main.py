@@ -12,6 +12,11 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # ── Core imports ──────────────────────────────────────────────────────────────
 try:
     from src.core.sovereign_reflection_engine import SovereignReflectionEngine
@@ -146,9 +151,11 @@ class ARK95XOrchestrator:
 
     async def interactive_loop(self):
         """Simple interactive REPL for direct orchestrator control."""
-        print(BANNER)
-        print(f"Session: {self.session_id}")
-        print("Commands: reflect <prompt> | crew <task> | improve | status | quit\n")
+        print(
+            f"{BANNER}\n"
+            f"Session: {self.session_id}\n"
+            "Commands: reflect <prompt> | crew <task> | improve | status | quit\n"
+        )
         while True:
             try:
                 line = input("ARK95X> ").strip()
@@ -157,19 +164,20 @@ class ARK95XOrchestrator:
                 break
             if not line:
                 continue
-            if line.lower() in ("quit", "exit", "q"):
+            cmd = line.lower()
+            if cmd in ("quit", "exit", "q"):
                 print("Goodbye.")
                 break
-            elif line.lower() == "status":
+            elif cmd == "status":
                 self._print_status()
-            elif line.lower() == "improve":
+            elif cmd == "improve":
                 result = await self.self_improve()
                 print(f"\nImprovement Plan:\n{result}\n")
-            elif line.lower().startswith("reflect "):
+            elif cmd.startswith("reflect "):
                 prompt = line[8:]
                 result = await self.reflect(prompt)
                 print(f"\nReflection:\n{result}\n")
-            elif line.lower().startswith("crew "):
+            elif cmd.startswith("crew "):
                 task = line[5:]
                 result = await self.run_crew_task(task)
                 print(f"\nCrew Result:\n{result}\n")
@@ -197,5 +205,8 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
             
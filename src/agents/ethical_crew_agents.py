@@ -93,14 +93,25 @@ DEFAULT_CREW = [
         learning_focus=["meta_learning", "strategy_evolution"]),
 ]
 
+TASK_TYPE_AGENTS = {
+    "design": "Architect", "architecture": "Architect",
+    "security": "Auditor", "audit": "Auditor", "ethics": "Auditor",
+    "debug": "Debugger", "troubleshoot": "Debugger", "fix": "Debugger",
+    "performance": "Optimizer", "scale": "Optimizer", "optimize": "Optimizer",
+    "learn": "Learner", "reflect": "Learner", "strategy": "Learner"}
+
 
 class EthicalCrewManager:
     """Manages the ethical programming crew lifecycle."""
 
     def __init__(self, agents: List[AgentProfile] = None):
         self.agents = agents or DEFAULT_CREW
+        self._agents_by_name: Dict[str, AgentProfile] = {}
+        for a in self.agents:
+            self._agents_by_name.setdefault(a.name, a)
         self.task_history: List[Dict] = []
         self.knowledge_base: Dict[str, List[str]] = {}
+        self._knowledge_entries = 0
         self.violation_log: List[Dict] = []
         logger.info(f"Crew initialized with {len(self.agents)} agents")
 
@@ -118,14 +129,8 @@ class EthicalCrewManager:
         return result
 
     def _select_agent(self, task_type: str) -> AgentProfile:
-        mapping = {
-            "design": "Architect", "architecture": "Architect",
-            "security": "Auditor", "audit": "Auditor", "ethics": "Auditor",
-            "debug": "Debugger", "troubleshoot": "Debugger", "fix": "Debugger",
-            "performance": "Optimizer", "scale": "Optimizer", "optimize": "Optimizer",
-            "learn": "Learner", "reflect": "Learner", "strategy": "Learner"}
-        target = mapping.get(task_type, "Architect")
-        return next((a for a in self.agents if a.name == target), self.agents[0])
+        target = TASK_TYPE_AGENTS.get(task_type, "Architect")
+        return self._agents_by_name.get(target, self.agents[0])
 
     def _generate_questions(self, task: str) -> List[str]:
         return [q.replace("this", f"'{task[:50]}'") for q in FOUNDATION_QUESTIONS]
@@ -142,7 +147,7 @@ class EthicalCrewManager:
 
     def learn_from_cycle(self, cycle_result: Dict):
         """Extract lessons from a completed task cycle."""
-        learner = next((a for a in self.agents if a.name == "Learner"), None)
+        learner = self._agents_by_name.get("Learner")
         if not learner:
             return
         lessons = []
@@ -152,13 +157,14 @@ class EthicalCrewManager:
             lessons.append("SLOW: Task took >5s - investigate bottleneck")
         for focus in learner.learning_focus:
             self.knowledge_base.setdefault(focus, []).extend(lessons)
+        self._knowledge_entries += len(lessons) * len(learner.learning_focus)
         logger.info(f"Learned {len(lessons)} lessons from cycle")
 
     def get_crew_status(self) -> Dict:
         return {
             "agents": [a.name for a in self.agents],
             "tasks_completed": len(self.task_history),
-            "knowledge_entries": sum(len(v) for v in self.knowledge_base.values()),
+            "knowledge_entries": self._knowledge_entries,
             "violations": len(self.violation_log),
             "ethical_standards": list(ETHICAL_STANDARDS.keys())}
 
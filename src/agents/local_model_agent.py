@@ -9,10 +9,23 @@ system with full hybrid routing capabilities.
 
 import asyncio
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
+_now = time.perf_counter
+
+_REQ_DEFAULTS: Dict[str, Any] = {
+    "task_type": "general",
+    "privacy_required": False,
+    "max_tokens": 500,
+    "temperature": 0.7,
+    "budget": 1.0,
+    "offline_capable": False,
+}
+
 
 class AgentRole(Enum):
     ANALYST = "analyst"
@@ -30,7 +43,7 @@ class AgentStatus(Enum):
     SHUTDOWN = "shutdown"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentTask:
     task_id: str
     description: str
@@ -58,68 +71,97 @@ class AgentMetrics:
 class LocalModelAgent:
     """Sovereign agent for local model processing in the ARK95X system."""
 
-    def __init__(self, agent_id: str, role: AgentRole = AgentRole.ANALYST):
+    def __init__(self, agent_id: str, role: AgentRole = AgentRole.ANALYST,
+                 history_size: int = 1000, max_concurrent: int = 5):
         self.agent_id = agent_id
         self.role = role
         self.status = AgentStatus.IDLE
         self.capabilities: List[str] = ["local_model_processing", "hybrid_routing", "perf_monitoring"]
         self.metrics = AgentMetrics()
-        self.task_history: List[AgentTask] = []
+        self.task_history: deque = deque(maxlen=history_size)
         self.loaded_models: List[str] = []
         self._router = None
         self._model_manager = None
         self._optimizer = None
+        self._route_sem = asyncio.Semaphore(max_concurrent)
+        self._warmup_task: Optional[asyncio.Task] = None
 
     def init_subsystems(
         self,
         ollama_host: str = "http://localhost:11434",
     ) -> None:
         """Initialize model subsystems (lazy import to avoid hard deps)."""
+        # The three subsystems are independent; build them in parallel so
+        # cold start costs the slowest import/constructor, not the sum
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            router = pool.submit(self._build_router, ollama_host)
+            manager = pool.submit(self._build_model_manager)
+            optimizer = pool.submit(self._build_optimizer)
+            self._router = router.result()
+            self._model_manager = manager.result()
+            self._optimizer = optimizer.result()
+
+        self.status = AgentStatus.ACTIVE
+        print(f"[Agent {self.agent_id}] Subsystems initialized - role: {self.role.value}")
+
+        # Preload the likely model in the background when called from a loop
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop and self._router:
+            self._warmup_task = loop.create_task(self.warmup())
+
+    async def warmup(self) -> bool:
+        """Load the best general-purpose local model ahead of the first task."""
+        if not self._router or not self._model_manager:
+            return False
+        best = self._select_model("general", 50)
+        if not best:
+            return False
+        return await self._router.warmup(best[0])
+
+    def _build_router(self, ollama_host: str):
         try:
             from models.hybrid_router import HybridModelRouter
-            self._router = HybridModelRouter(ollama_host)
+            return HybridModelRouter(ollama_host)
         except ImportError:
             print(f"[Agent {self.agent_id}] HybridModelRouter not available")
+            return None
 
+    def _build_model_manager(self):
         try:
             from models.local_model_manager import LocalModelManager
-            self._model_manager = LocalModelManager()
+            return LocalModelManager()
         except ImportError:
             print(f"[Agent {self.agent_id}] LocalModelManager not available")
+            return None
 
+    def _build_optimizer(self):
         try:
             from models.performance_optimizer import ModelPerformanceOptimizer
-            self._optimizer = ModelPerformanceOptimizer()
+            return ModelPerformanceOptimizer()
         except ImportError:
             print(f"[Agent {self.agent_id}] PerformanceOptimizer not available")
-
-        self.status = AgentStatus.ACTIVE
-        print(f"[Agent {self.agent_id}] Subsystems initialized - role: {self.role.value}")
+            return None
 
     async def execute_task(self, task: AgentTask) -> Dict[str, Any]:
         """Execute a task using local/hybrid model routing."""
         self.status = AgentStatus.PROCESSING
-        start = time.time()
+        start = _now()
 
         try:
             # Build requirements from task parameters
-            requirements = {
-                "task_type": task.parameters.get("task_type", "general"),
-                "privacy_required": task.parameters.get("privacy_required", False),
-                "max_tokens": task.parameters.get("max_tokens", 500),
-                "temperature": task.parameters.get("temperature", 0.7),
-                "budget": task.parameters.get("budget", 1.0),
-                "offline_capable": task.parameters.get("offline_capable", False),
-            }
+            requirements = _REQ_DEFAULTS.copy()
+            if task.parameters:
+                requirements.update(
+                    (k, v) for k, v in task.parameters.items() if k in _REQ_DEFAULTS
+                )
 
             # Model selection via manager
             selected_model = None
             if self._model_manager:
-                result = self._model_manager.get_best_model_for_task({
-                    "type": requirements["task_type"],
-                    "hardware": "gpu",
-                    "priority": "high" if task.priority > 70 else "normal",
-                })
+                result = self._select_model(requirements["task_type"], task.priority)
                 if result:
                     selected_model = result[0]
                     print(f"[Agent {self.agent_id}] Selected model: {selected_model} (score: {result[1]:.1f})")
@@ -131,11 +173,13 @@ class LocalModelAgent:
 
             # Route and execute
             if self._router:
-                routing_result = await self._router.route_request(
-                    task.description, requirements
-                )
+                # Identical in-flight requests are coalesced by the router
+                async with self._route_sem:
+                    routing_result = await self._router.route_request(
+                        task.description, requirements
+                    )
 
-                latency = (time.time() - start) * 1000
+                latency = (_now() - start) * 1000
                 self._update_metrics(routing_result, latency)
 
                 task.result = {
@@ -160,7 +204,7 @@ class LocalModelAgent:
             return task.result
 
         except Exception as e:
-            latency = (time.time() - start) * 1000
+            latency = (_now() - start) * 1000
             self.metrics.tasks_failed += 1
             task.error = str(e)
             task.completed_at = time.time()
@@ -168,6 +212,14 @@ class LocalModelAgent:
             self.status = AgentStatus.ERROR
             return {"success": False, "error": str(e), "latency_ms": latency}
 
+    def _select_model(self, task_type: str, priority: int):
+        """Best model for a task; the manager memoizes selections itself."""
+        return self._model_manager.get_best_model_for_task({
+            "type": task_type,
+            "hardware": "gpu",
+            "priority": "high" if priority > 70 else "normal",
+        })
+
     def _update_metrics(self, result: Any, latency_ms: float) -> None:
         """Update agent metrics from routing result."""
         if result.success:
@@ -203,17 +255,34 @@ class LocalModelAgent:
             "optimizer_available": self._optimizer is not None,
         }
 
+        probes = {}
         if self._optimizer:
-            health["hardware"] = self._optimizer.get_summary()["hardware"]
-
+            probes["hardware"] = lambda: self._optimizer.get_summary()["hardware"]
         if self._model_manager:
-            health["models"] = self._model_manager.get_inventory()
-
+            probes["models"] = self._model_manager.get_inventory
         if self._router:
-            health["routing"] = self._router.get_status()
+            probes["routing"] = self._router.get_status
+
+        # The probes only read in-memory state, so run them inline on the loop
+        # (their caches aren't thread-safe); a failing probe is reported in
+        # place instead of failing the whole check
+        for key, fn in probes.items():
+            try:
+                health[key] = fn()
+            except Exception as e:
+                health[key] = {"error": str(e)}
 
         return health
 
+    async def shutdown(self) -> None:
+        """Release pooled connections held by the router."""
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+            self._warmup_task = None
+        if self._router:
+            await self._router.close()
+        self.status = AgentStatus.SHUTDOWN
+
     def get_metrics(self) -> Dict[str, Any]:
         """Get agent performance metrics."""
         return {
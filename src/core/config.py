@@ -11,6 +11,17 @@ from pathlib import Path
 
 logger = logging.getLogger("ark95x.config")
 
+_UNSET = object()
+_MISSING = object()
+
+
+def _copy_tree(d: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep-copy a JSON-shaped config dict without a serialize round-trip."""
+    return {
+        k: _copy_tree(v) if isinstance(v, dict) else list(v) if isinstance(v, list) else v
+        for k, v in d.items()
+    }
+
 
 @dataclass
 class ConfigProfile:
@@ -44,6 +55,9 @@ class ConfigManager:
             "retention_points": 10000,
             "snapshot_window": 60,
             "alert_cooldown": 300,
+            "buffered_writes": False,
+            "flush_interval": 0.5,
+            "write_buffer": 65536,
         },
         "models": {
             "default_provider": "ollama",
@@ -59,20 +73,25 @@ class ConfigManager:
         },
     }
 
+    SECRET_KEYS = frozenset(("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "OLLAMA_HOST"))
+
     def __init__(self, config_path: Optional[str] = None, env_prefix: str = "ARK95X"):
         self.env_prefix = env_prefix
         self.profiles: Dict[str, ConfigProfile] = {}
         self._active_profile = "default"
         self._config: Dict[str, Any] = {}
         self._secrets: Dict[str, str] = {}
+        # Resolved dotted-path lookups; cleared whenever _config changes
+        self._resolved: Dict[str, Any] = {}
         self._load_defaults()
         if config_path:
             self._load_file(config_path)
         self._load_env()
 
     def _load_defaults(self):
-        self._config = json.loads(json.dumps(self.DEFAULT_CONFIG))
-        self.profiles["default"] = ConfigProfile(name="default", values=dict(self._config))
+        self._config = _copy_tree(self.DEFAULT_CONFIG)
+        self._resolved.clear()
+        self.profiles["default"] = ConfigProfile(name="default", values=_copy_tree(self._config))
 
     def _load_file(self, path: str):
         p = Path(path)
@@ -83,20 +102,21 @@ class ConfigManager:
             with open(p) as f:
                 data = json.load(f)
             self._deep_merge(self._config, data)
+            self._resolved.clear()
             logger.info(f"Loaded config from {path}")
         except Exception as e:
             logger.error(f"Failed to load config: {e}")
 
     def _load_env(self):
+        prefix = f"{self.env_prefix}_"
+        plen = len(prefix)
         for key, value in os.environ.items():
-            if key.startswith(f"{self.env_prefix}_"):
-                parts = key[len(self.env_prefix) + 1:].lower().split("__")
+            if key.startswith(prefix):
+                parts = key[plen:].lower().split("__")
                 self._set_nested(self._config, parts, self._parse_value(value))
-        api_keys = ["OPENAI_API_KEY", "ANTHROPIC_API_KEY", "OLLAMA_HOST"]
-        for k in api_keys:
-            val = os.environ.get(k)
-            if val:
-                self._secrets[k] = val
+            if key in self.SECRET_KEYS and value:
+                self._secrets[key] = value
+        self._resolved.clear()
 
     @staticmethod
     def _parse_value(value: str) -> Any:
@@ -130,18 +150,32 @@ class ConfigManager:
         d[keys[-1]] = value
 
     def get(self, path: str, default: Any = None) -> Any:
-        parts = path.split(".")
+        """Value at a dotted path.
+
+        Sections (dicts/lists) are the live config and are treated as
+        read-only; change values through set() so cached lookups stay valid.
+        Only leaf values are cached, so sections are never served stale.
+        """
+        value = self._resolved.get(path, _UNSET)
+        if value is _UNSET:
+            value = self._resolve(path)
+            if not isinstance(value, (dict, list)):
+                self._resolved[path] = value
+        return default if value is _MISSING else value
+
+    def _resolve(self, path: str) -> Any:
         current = self._config
-        for p in parts:
+        for p in path.split("."):
             if isinstance(current, dict) and p in current:
                 current = current[p]
             else:
-                return default
+                return _MISSING
         return current
 
     def set(self, path: str, value: Any) -> None:
         parts = path.split(".")
         self._set_nested(self._config, parts, value)
+        self._resolved.clear()
 
     def get_secret(self, key: str) -> Optional[str]:
         return self._secrets.get(key)
@@ -157,6 +191,7 @@ class ConfigManager:
         if profile.parent and profile.parent in self.profiles:
             self._deep_merge(self._config, self.profiles[profile.parent].values)
         self._deep_merge(self._config, profile.values)
+        self._resolved.clear()
         self._active_profile = name
         self._load_env()
         logger.info(f"Activated profile: {name}")
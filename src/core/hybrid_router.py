@@ -13,7 +13,8 @@ import requests
 import json
 import time
 import logging
-from typing import Dict, Any, Optional, List
+from collections import deque
+from typing import Dict, Any, Optional
 from dataclasses import dataclass, field
 
 logger = logging.getLogger("ark95x.router")
@@ -29,6 +30,14 @@ class RouteDecision:
     layer: int = 4
 
 
+def _index_by_type(models: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+    """Map each task type to the first model declared for it."""
+    index: Dict[str, str] = {}
+    for model, info in models.items():
+        index.setdefault(info["type"], model)
+    return index
+
+
 class HybridRouter:
     """Routes AI requests to optimal provider based on task, cost, privacy."""
 
@@ -52,7 +61,12 @@ class HybridRouter:
         self.openai_key = config.get("openai_api_key", "")
         self.anthropic_key = config.get("anthropic_api_key", "")
         self.privacy_mode = config.get("privacy_mode", False)
-        self.request_log: List[Dict] = []
+        self._local_by_type = _index_by_type(self.LOCAL_MODELS)
+        self._cloud_by_type = _index_by_type(self.CLOUD_MODELS)
+        self.request_log: deque = deque(maxlen=config.get("request_log_size", 1000))
+        self._total_requests = 0
+        self._success_count = 0
+        self._providers_used: set = set()
 
     def route(self, prompt: str, task_type: str = "general",
              priority: str = "normal") -> RouteDecision:
@@ -66,7 +80,7 @@ class HybridRouter:
         return RouteDecision("fallback_local", model, task_type, priority, True, 1)
 
     def execute(self, route: RouteDecision, prompt: str) -> Dict[str, Any]:
-        start = time.time()
+        start = time.perf_counter()
         try:
             if route.provider in ("local", "fallback_local"):
                 result = self._call_ollama(route.model, prompt)
@@ -76,7 +90,7 @@ class HybridRouter:
                 result = self._call_anthropic(route.model, prompt)
             else:
                 result = self._call_ollama("llama3.1", prompt)
-            result["duration_ms"] = round((time.time() - start) * 1000, 2)
+            result["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
             self._log_request(route, result)
             return result
         except Exception as e:
@@ -84,15 +98,15 @@ class HybridRouter:
             return {"success": False, "error": str(e), "provider": route.provider}
 
     def _select_local(self, task_type: str) -> str:
-        for model, info in self.LOCAL_MODELS.items():
-            if info["type"] == task_type:
-                return model
+        model = self._local_by_type.get(task_type)
+        if model:
+            return model
         return self.config.get("default_local_model", "llama3.1")
 
     def _select_cloud(self, task_type: str) -> str:
-        for model, info in self.CLOUD_MODELS.items():
-            if info["type"] == task_type:
-                return model
+        model = self._cloud_by_type.get(task_type)
+        if model:
+            return model
         return self.config.get("default_cloud_model", "gpt-4o")
 
     def _call_ollama(self, model: str, prompt: str) -> Dict:
@@ -141,15 +155,21 @@ class HybridRouter:
         return {"success": False, "error": f"HTTP {r.status_code}"}
 
     def _log_request(self, route: RouteDecision, result: Dict):
+        success = result.get("success", False)
         self.request_log.append({
             "timestamp": time.time(), "provider": route.provider,
             "model": route.model, "task_type": route.task_type,
-            "success": result.get("success", False),
+            "success": success,
             "tokens": result.get("tokens", 0),
             "duration_ms": result.get("duration_ms", 0)})
+        # Running totals keep get_stats O(providers) instead of O(requests)
+        self._total_requests += 1
+        if success:
+            self._success_count += 1
+        self._providers_used.add(route.provider)
 
     def get_stats(self) -> Dict:
-        total = len(self.request_log)
-        success = sum(1 for r in self.request_log if r["success"])
-        return {"total_requests": total, "success_rate": success / max(total, 1),
-                "providers_used": list(set(r["provider"] for r in self.request_log))}
+        total = self._total_requests
+        return {"total_requests": total,
+                "success_rate": self._success_count / max(total, 1),
+                "providers_used": list(self._providers_used)}
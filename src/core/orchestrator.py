@@ -3,15 +3,18 @@ Autonomous multi-agent orchestration with self-healing,
 adaptive routing, and continuous optimization.
 """
 import asyncio
+import itertools
 import time
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, NamedTuple, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import deque
 
 logger = logging.getLogger("ark95x.orchestrator")
 
+_now = time.perf_counter
+
 
 class AgentState(Enum):
     IDLE = "idle"
@@ -40,7 +43,7 @@ class TaskEnvelope:
     deadline: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentDescriptor:
     agent_id: str
     capabilities: List[str]
@@ -51,13 +54,25 @@ class AgentDescriptor:
     tasks_completed: int = 0
 
 
+class ErrorRecord(NamedTuple):
+    time: float
+    error: str
+
+
 class OrchestratorEngine:
     """Core orchestration engine with adaptive scheduling."""
 
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
         self.agents: Dict[str, AgentDescriptor] = {}
+        # Ids of IDLE agents in the order they became idle, maintained on
+        # every state change; ties in selection go to the longest idle
+        self._idle: Dict[str, None] = {}
         self.task_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        # FIFO tie-break within a priority; envelopes are never compared
+        self._task_seq = itertools.count()
+        # Set whenever an agent goes IDLE; the loop waits on it instead of polling
+        self._agent_available = asyncio.Event()
         self.results: Dict[str, Any] = {}
         self.metrics: Dict[str, deque] = {
             "throughput": deque(maxlen=1000),
@@ -66,36 +81,79 @@ class OrchestratorEngine:
         }
         self._running = False
         self._loop_task: Optional[asyncio.Task] = None
+        self._health_task: Optional[asyncio.Task] = None
+        # Running _execute_task tasks; held so they aren't collected mid-flight
+        self._task_handles: set = set()
         self._heal_interval = self.config.get("heal_interval", 30)
         self._scale_threshold = self.config.get("scale_threshold", 0.85)
+        self._dispatch_batch = self.config.get("dispatch_batch", 16)
 
     def register_agent(self, descriptor: AgentDescriptor) -> None:
         self.agents[descriptor.agent_id] = descriptor
+        self._track_state(descriptor)
         logger.info(f"Agent registered: {descriptor.agent_id}")
 
+    def register_agents(self, descriptors: Iterable[AgentDescriptor]) -> None:
+        batch = {d.agent_id: d for d in descriptors}
+        self.agents.update(batch)
+        for d in batch.values():
+            self._track_state(d)
+        logger.info(f"Agents registered: {len(batch)}")
+
     async def submit_task(self, envelope: TaskEnvelope) -> str:
-        await self.task_queue.put((envelope.priority.value, envelope))
+        await self.task_queue.put(
+            (envelope.priority.value, next(self._task_seq), envelope)
+        )
         logger.debug(f"Task queued: {envelope.task_id} [{envelope.priority.name}]")
         return envelope.task_id
 
-    def _select_agent(self, task: TaskEnvelope) -> Optional[str]:
-        candidates = [
-            (aid, a) for aid, a in self.agents.items()
-            if a.state == AgentState.IDLE and a.load < self._scale_threshold
-        ]
-        if not candidates:
-            return None
-        candidates.sort(key=lambda x: (-x[1].success_rate, x[1].avg_latency))
-        return candidates[0][0]
+    def set_agent_state(self, agent_id: str, state: AgentState) -> None:
+        """Change an agent's state and keep the idle index in sync."""
+        self._set_state(self.agents[agent_id], state)
+
+    def _set_state(self, agent: AgentDescriptor, state: AgentState) -> None:
+        agent.state = state
+        self._track_state(agent)
+
+    def _track_state(self, agent: AgentDescriptor) -> None:
+        if agent.state is AgentState.IDLE:
+            self._idle[agent.agent_id] = None
+            self._agent_available.set()
+        else:
+            self._idle.pop(agent.agent_id, None)
+
+    def _dispatchable(self) -> Iterable[AgentDescriptor]:
+        agents = self.agents
+        found = False
+        for aid in self._idle:
+            a = agents.get(aid)
+            if a and a.state is AgentState.IDLE and a.load < self._scale_threshold:
+                found = True
+                yield a
+        if found:
+            return
+        # The index only sees set_agent_state changes; pick up agents whose
+        # state was assigned directly
+        for a in list(agents.values()):
+            if a.state is AgentState.IDLE and a.agent_id not in self._idle:
+                self._track_state(a)
+                if a.load < self._scale_threshold:
+                    yield a
+
+    def _idle_agents(self) -> List[str]:
+        """Dispatchable agents, best first, for assigning a batch of tasks."""
+        candidates = list(self._dispatchable())
+        candidates.sort(key=lambda a: (-a.success_rate, a.avg_latency))
+        return [a.agent_id for a in candidates]
 
     async def _execute_task(self, agent_id: str, task: TaskEnvelope) -> Any:
         agent = self.agents[agent_id]
-        agent.state = AgentState.RUNNING
+        self._set_state(agent, AgentState.RUNNING)
         agent.load = min(1.0, agent.load + 0.2)
-        start = time.time()
+        start = _now()
         try:
             result = await self._dispatch(agent_id, task)
-            elapsed = time.time() - start
+            elapsed = _now() - start
             agent.avg_latency = (agent.avg_latency * 0.9) + (elapsed * 0.1)
             agent.tasks_completed += 1
             agent.success_rate = min(1.0, agent.success_rate + 0.01)
@@ -105,7 +163,7 @@ class OrchestratorEngine:
             return result
         except Exception as e:
             agent.success_rate = max(0.0, agent.success_rate - 0.1)
-            self.metrics["errors"].append({"time": time.time(), "error": str(e)})
+            self.metrics["errors"].append(ErrorRecord(time.time(), str(e)))
             if task.retries < task.max_retries:
                 task.retries += 1
                 await self.submit_task(task)
@@ -114,7 +172,7 @@ class OrchestratorEngine:
                 self.results[task.task_id] = {"status": "failed", "error": str(e)}
                 logger.error(f"Task failed permanently: {task.task_id}")
         finally:
-            agent.state = AgentState.IDLE
+            self._set_state(agent, AgentState.IDLE)
             agent.load = max(0.0, agent.load - 0.2)
 
     async def _dispatch(self, agent_id: str, task: TaskEnvelope) -> Any:
@@ -128,15 +186,31 @@ class OrchestratorEngine:
         logger.info("Orchestrator engine started")
         while self._running:
             try:
-                priority, task = await asyncio.wait_for(
-                    self.task_queue.get(), timeout=1.0
-                )
-                agent_id = self._select_agent(task)
-                if agent_id:
-                    asyncio.create_task(self._execute_task(agent_id, task))
-                else:
-                    await self.submit_task(task)
-                    await asyncio.sleep(0.5)
+                item = await asyncio.wait_for(self.task_queue.get(), timeout=1.0)
+                agent_ids = self._idle_agents()
+                if not agent_ids:
+                    # Put the original entry back so it keeps its queue position
+                    self._agent_available.clear()
+                    self.task_queue.put_nowait(item)
+                    await asyncio.wait_for(self._agent_available.wait(), timeout=1.0)
+                    continue
+                # Drain only as many queued tasks as there are idle agents and
+                # assign them against one ranked agent list
+                batch = [item[2]]
+                limit = min(len(agent_ids), self._dispatch_batch)
+                while len(batch) < limit:
+                    try:
+                        batch.append(self.task_queue.get_nowait()[2])
+                    except asyncio.QueueEmpty:
+                        break
+                for agent_id, task in zip(agent_ids, batch):
+                    # Claim the agent now so the next batch can't pick it
+                    # before the task gets to run
+                    self._set_state(self.agents[agent_id], AgentState.RUNNING)
+                    handle = asyncio.create_task(
+                        self._execute_task(agent_id, task), name="ark95x.orchestrator.task")
+                    self._task_handles.add(handle)
+                    handle.add_done_callback(self._task_handles.discard)
             except asyncio.TimeoutError:
                 continue
             except Exception as e:
@@ -145,24 +219,33 @@ class OrchestratorEngine:
 
     async def start(self):
         self._running = True
-        self._loop_task = asyncio.create_task(self._main_loop())
-        asyncio.create_task(self._health_monitor())
+        self._loop_task = asyncio.create_task(
+            self._main_loop(), name="ark95x.orchestrator.loop")
+        self._health_task = asyncio.create_task(
+            self._health_monitor(), name="ark95x.orchestrator.health")
         logger.info("Orchestrator fully operational")
 
     async def stop(self):
         self._running = False
-        if self._loop_task:
-            self._loop_task.cancel()
+        tasks = [t for t in (self._loop_task, self._health_task) if t]
+        tasks.extend(self._task_handles)
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = self._health_task = None
         logger.info("Orchestrator stopped")
 
     async def _health_monitor(self):
         while self._running:
             await asyncio.sleep(self._heal_interval)
-            for aid, agent in self.agents.items():
-                if agent.success_rate < 0.5:
-                    agent.state = AgentState.RECOVERING
-                    logger.warning(f"Agent {aid} degraded, triggering recovery")
-                    await self._recover_agent(aid)
+            try:
+                for aid, agent in list(self.agents.items()):
+                    if agent.success_rate < 0.5:
+                        self._set_state(agent, AgentState.RECOVERING)
+                        logger.warning(f"Agent {aid} degraded, triggering recovery")
+                        await self._recover_agent(aid)
+            except Exception as e:
+                logger.error(f"Health monitor error: {e}")
 
     async def _recover_agent(self, agent_id: str):
         agent = self.agents.get(agent_id)
@@ -170,7 +253,7 @@ class OrchestratorEngine:
             return
         agent.load = 0.0
         agent.success_rate = 0.7
-        agent.state = AgentState.IDLE
+        self._set_state(agent, AgentState.IDLE)
         logger.info(f"Agent {agent_id} recovered")
 
     def get_status(self) -> Dict[str, Any]:
@@ -3,14 +3,18 @@ DAG-based task pipeline with parallel execution,
 dependency resolution, and streaming data flow.
 """
 import asyncio
+import itertools
+import random
 import time
 import logging
-from typing import Dict, List, Any, Optional, Callable, Set
+from typing import Dict, List, Any, Optional, Callable, Set, Sequence
 from dataclasses import dataclass, field
 from enum import Enum
 
 logger = logging.getLogger("ark95x.pipeline")
 
+_now = time.perf_counter
+
 
 class StageStatus(Enum):
     PENDING = "pending"
@@ -20,11 +24,11 @@ class StageStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineStage:
     name: str
     handler: Optional[Callable] = None
-    dependencies: List[str] = field(default_factory=list)
+    dependencies: Sequence[str] = ()
     status: StageStatus = StageStatus.PENDING
     result: Any = None
     error: Optional[str] = None
@@ -41,6 +45,7 @@ class PipelineRun:
     stages: Dict[str, PipelineStage] = field(default_factory=dict)
     start_time: float = 0.0
     end_time: float = 0.0
+    duration: float = 0.0
     status: str = "pending"
 
 
@@ -53,16 +58,17 @@ class PipelineManager:
         self.runs: Dict[str, PipelineRun] = {}
         self.max_parallel = self.config.get("max_parallel", 10)
         self._semaphore = asyncio.Semaphore(self.max_parallel)
+        self._run_seq = itertools.count(1)
+        self._order_cache: Dict[str, List[List[str]]] = {}
 
     def define_pipeline(self, name: str, stages: List[PipelineStage]) -> None:
         self.pipelines[name] = stages
+        self._order_cache.pop(name, None)
         logger.info(f"Pipeline defined: {name} ({len(stages)} stages)")
 
     def _resolve_order(self, stages: List[PipelineStage]) -> List[List[str]]:
-        graph: Dict[str, Set[str]] = {}
-        for s in stages:
-            graph[s.name] = set(s.dependencies)
-        levels = []
+        graph: Dict[str, Set[str]] = {s.name: set(s.dependencies) for s in stages}
+        levels: List[List[str]] = []
         resolved: Set[str] = set()
         while graph:
             ready = [n for n, deps in graph.items() if deps <= resolved]
@@ -81,75 +87,82 @@ class PipelineManager:
         if not stages_def:
             raise KeyError(f"Pipeline not found: {pipeline_name}")
 
-        run_id = f"{pipeline_name}_{int(time.time())}"
+        start_time = time.time()
+        started = _now()
+        run_id = f"{pipeline_name}_{int(start_time)}_{next(self._run_seq)}"
         stage_map = {s.name: PipelineStage(
             name=s.name, handler=s.handler,
-            dependencies=list(s.dependencies),
+            dependencies=s.dependencies,
             max_retries=s.max_retries, timeout=s.timeout
         ) for s in stages_def}
 
         run = PipelineRun(
             run_id=run_id, pipeline_name=pipeline_name,
-            stages=stage_map, start_time=time.time(), status="running"
+            stages=stage_map, start_time=start_time, status="running"
         )
         self.runs[run_id] = run
         ctx = context or {}
         ctx["__results__"] = {}
 
         try:
-            levels = self._resolve_order(list(stage_map.values()))
+            levels = self._order_cache.get(pipeline_name)
+            if levels is None:
+                levels = self._resolve_order(stages_def)
+                self._order_cache[pipeline_name] = levels
             for level in levels:
-                tasks = []
-                for stage_name in level:
-                    stage = stage_map[stage_name]
-                    deps_ok = all(
-                        stage_map[d].status == StageStatus.COMPLETED
+                stages = [stage_map[n] for n in level]
+                for stage in stages:
+                    if not all(
+                        stage_map[d].status is StageStatus.COMPLETED
                         for d in stage.dependencies
-                    )
-                    if not deps_ok:
+                    ):
                         stage.status = StageStatus.SKIPPED
-                        continue
-                    tasks.append(self._run_stage(stage, ctx))
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
+                async with asyncio.TaskGroup() as tg:
+                    for stage in stages:
+                        if stage.status is StageStatus.PENDING:
+                            tg.create_task(self._run_stage(stage, ctx))
 
-            failed = [s for s in stage_map.values() if s.status == StageStatus.FAILED]
+            failed = [s for s in stage_map.values() if s.status is StageStatus.FAILED]
             run.status = "failed" if failed else "completed"
         except Exception as e:
             run.status = "error"
             logger.error(f"Pipeline {run_id} error: {e}")
         finally:
             run.end_time = time.time()
+            run.duration = _now() - started
 
-        logger.info(f"Pipeline {run_id} {run.status} in {run.end_time - run.start_time:.2f}s")
+        logger.info(f"Pipeline {run_id} {run.status} in {run.duration:.2f}s")
         return run
 
     async def _run_stage(self, stage: PipelineStage, ctx: Dict) -> None:
-        async with self._semaphore:
-            stage.status = StageStatus.RUNNING
-            start = time.time()
-            for attempt in range(stage.max_retries + 1):
-                try:
+        start = None
+        for attempt in range(stage.max_retries + 1):
+            try:
+                # Hold a slot only while the handler runs, not during backoff
+                async with self._semaphore:
+                    if start is None:
+                        stage.status = StageStatus.RUNNING
+                        start = _now()
                     if stage.handler:
                         result = await asyncio.wait_for(
                             stage.handler(ctx), timeout=stage.timeout
                         )
                         stage.result = result
                         ctx["__results__"][stage.name] = result
-                    stage.status = StageStatus.COMPLETED
-                    stage.duration = time.time() - start
-                    return
-                except asyncio.TimeoutError:
-                    stage.error = f"Timeout after {stage.timeout}s"
-                    stage.retries = attempt + 1
-                except Exception as e:
-                    stage.error = str(e)
-                    stage.retries = attempt + 1
-                    if attempt < stage.max_retries:
-                        await asyncio.sleep(2 ** attempt)
-            stage.status = StageStatus.FAILED
-            stage.duration = time.time() - start
-            logger.error(f"Stage {stage.name} failed: {stage.error}")
+                stage.status = StageStatus.COMPLETED
+                stage.duration = _now() - start
+                return
+            except asyncio.TimeoutError:
+                stage.error = f"Timeout after {stage.timeout}s"
+                stage.retries = attempt + 1
+            except Exception as e:
+                stage.error = str(e)
+                stage.retries = attempt + 1
+                if attempt < stage.max_retries:
+                    await asyncio.sleep(random.uniform(0, min(30, 2 ** attempt)))
+        stage.status = StageStatus.FAILED
+        stage.duration = _now() - start
+        logger.error(f"Stage {stage.name} failed: {stage.error}")
 
     def get_run_summary(self, run_id: str) -> Dict[str, Any]:
         run = self.runs.get(run_id)
@@ -158,7 +171,7 @@ class PipelineManager:
         return {
             "run_id": run.run_id,
             "status": run.status,
-            "duration": run.end_time - run.start_time if run.end_time else 0,
+            "duration": run.duration,
             "stages": {
                 k: {"status": v.status.value, "duration": v.duration}
                 for k, v in run.stages.items()
@@ -3,9 +3,13 @@ Autonomous fault detection, diagnosis, and recovery
 with circuit breaker patterns and adaptive retry logic.
 """
 import asyncio
+import heapq
+import itertools
+import re
 import time
 import logging
-from typing import Dict, List, Any, Optional, Callable
+from array import array
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import deque
@@ -28,6 +32,24 @@ class FailureType(Enum):
     UNKNOWN = "unknown"
 
 
+# Keyword groups in priority order; group N maps to _FAILURE_BY_GROUP[N]
+_FAILURE_PATTERN = re.compile(
+    r"(timeout)|(memory|resource)|(connection|network)|(dependency|import)",
+    re.IGNORECASE,
+)
+_FAILURE_BY_GROUP = (
+    FailureType.UNKNOWN, FailureType.TIMEOUT, FailureType.RESOURCE,
+    FailureType.NETWORK, FailureType.DEPENDENCY,
+)
+# Exception types that classify without looking at the message
+_FAILURE_BY_TYPE = (
+    (TimeoutError, FailureType.TIMEOUT),
+    (MemoryError, FailureType.RESOURCE),
+    (ConnectionError, FailureType.NETWORK),
+    (ImportError, FailureType.DEPENDENCY),
+)
+
+
 @dataclass
 class HealthCheck:
     name: str
@@ -51,10 +73,21 @@ class IncidentRecord:
 
 
 class CircuitBreaker:
-    """Circuit breaker to prevent cascade failures."""
+    """Circuit breaker to prevent cascade failures.
+
+    Recent outcomes are kept in a fixed ring of timestamps plus a
+    success byte per slot rather than one dict per call.
+    """
+
+    __slots__ = (
+        "name", "_state", "_closed", "failure_count", "success_count",
+        "failure_threshold", "recovery_timeout", "half_open_max",
+        "last_failure_time", "_ts", "_ok", "_head", "_size", "_cap",
+    )
 
     def __init__(self, name: str, failure_threshold: int = 5,
-                 recovery_timeout: float = 60.0, half_open_max: int = 3):
+                 recovery_timeout: float = 60.0, half_open_max: int = 3,
+                 sample_size: int = 200):
         self.name = name
         self.state = CircuitState.CLOSED
         self.failure_count = 0
@@ -63,12 +96,44 @@ class CircuitBreaker:
         self.recovery_timeout = recovery_timeout
         self.half_open_max = half_open_max
         self.last_failure_time = 0.0
-        self.metrics = deque(maxlen=200)
+        self._cap = sample_size
+        self._ts = array("d", bytes(8 * sample_size))
+        self._ok = bytearray(sample_size)
+        self._head = 0
+        self._size = 0
+
+    def _record(self, now: float, ok: int) -> None:
+        i = self._head
+        self._ts[i] = now
+        self._ok[i] = ok
+        self._head = (i + 1) % self._cap
+        if self._size < self._cap:
+            self._size += 1
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    @state.setter
+    def state(self, value: CircuitState) -> None:
+        # Mirror CLOSED into a bool so the common can_execute path is one load
+        self._state = value
+        self._closed = value is CircuitState.CLOSED
+
+    @property
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Recent outcomes, oldest first."""
+        cap = self._cap
+        start = (self._head - self._size) % cap
+        return [
+            {"time": self._ts[j], "success": bool(self._ok[j])}
+            for j in ((start + k) % cap for k in range(self._size))
+        ]
 
     def can_execute(self) -> bool:
-        if self.state == CircuitState.CLOSED:
+        if self._closed:
             return True
-        if self.state == CircuitState.OPEN:
+        if self._state is CircuitState.OPEN:
             if time.time() - self.last_failure_time > self.recovery_timeout:
                 self.state = CircuitState.HALF_OPEN
                 self.success_count = 0
@@ -77,8 +142,8 @@ class CircuitBreaker:
         return self.success_count < self.half_open_max
 
     def record_success(self):
-        self.metrics.append({"time": time.time(), "success": True})
-        if self.state == CircuitState.HALF_OPEN:
+        self._record(time.time(), 1)
+        if self._state is CircuitState.HALF_OPEN:
             self.success_count += 1
             if self.success_count >= self.half_open_max:
                 self.state = CircuitState.CLOSED
@@ -89,8 +154,9 @@ class CircuitBreaker:
 
     def record_failure(self):
         self.failure_count += 1
-        self.last_failure_time = time.time()
-        self.metrics.append({"time": time.time(), "success": False})
+        now = time.time()
+        self.last_failure_time = now
+        self._record(now, 0)
         if self.failure_count >= self.failure_threshold:
             self.state = CircuitState.OPEN
             logger.warning(f"Circuit {self.name} OPEN after {self.failure_count} failures")
@@ -103,10 +169,22 @@ class SelfHealingEngine:
         self.config = config or {}
         self.circuits: Dict[str, CircuitBreaker] = {}
         self.health_checks: Dict[str, HealthCheck] = {}
-        self.incidents: List[IncidentRecord] = []
         self.recovery_strategies: Dict[FailureType, Callable] = {}
         self._running = False
+        self._health_task: Optional[asyncio.Task] = None
         self._max_incidents = self.config.get("max_incidents", 1000)
+        self.incidents: deque = deque(maxlen=self._max_incidents)
+        # Resolved incidents still retained, and incidents ever recorded
+        self._resolved_count = 0
+        self._incident_total = 0
+        self._incident_seq = itertools.count(1)
+        # Min-heap of (next_due, seq, check); the seq keeps checks uncompared
+        self._due: List[Tuple[float, int, HealthCheck]] = []
+        self._check_seq = itertools.count()
+        # Check name -> seq of its live heap entry; other entries are stale
+        self._scheduled: Dict[str, int] = {}
+        # Set on registration so the loop picks up new checks without waiting
+        self._checks_changed = asyncio.Event()
 
     def add_circuit(self, name: str, **kwargs) -> CircuitBreaker:
         cb = CircuitBreaker(name, **kwargs)
@@ -114,7 +192,16 @@ class SelfHealingEngine:
         return cb
 
     def register_health_check(self, check: HealthCheck) -> None:
+        if self.health_checks.get(check.name) is check:
+            return  # already scheduled
         self.health_checks[check.name] = check
+        self._schedule(check, check.last_check + check.interval)
+        self._checks_changed.set()
+
+    def _schedule(self, check: HealthCheck, due_at: float) -> None:
+        seq = next(self._check_seq)
+        self._scheduled[check.name] = seq
+        heapq.heappush(self._due, (due_at, seq, check))
 
     def register_recovery(self, failure_type: FailureType, fn: Callable):
         self.recovery_strategies[failure_type] = fn
@@ -138,27 +225,33 @@ class SelfHealingEngine:
             circuit.record_failure()
             failure_type = self._classify_failure(e)
             incident = IncidentRecord(
-                incident_id=f"inc_{int(time.time())}_{circuit_name}",
+                incident_id=f"inc_{int(time.time())}_{next(self._incident_seq)}_{circuit_name}",
                 failure_type=failure_type,
                 component=circuit_name,
             )
-            self.incidents.append(incident)
-            if len(self.incidents) > self._max_incidents:
-                self.incidents = self.incidents[-self._max_incidents:]
+            incidents = self.incidents
+            if incidents and len(incidents) == incidents.maxlen and incidents[0].resolved:
+                self._resolved_count -= 1
+            incidents.append(incident)
+            pos = self._incident_total
+            self._incident_total += 1
             await self._attempt_recovery(incident, e)
+            # Only count it if it wasn't evicted while recovery was running
+            if incident.resolved and pos >= self._incident_total - len(incidents):
+                self._resolved_count += 1
             raise
 
     def _classify_failure(self, error: Exception) -> FailureType:
-        err_str = str(error).lower()
-        if "timeout" in err_str:
-            return FailureType.TIMEOUT
-        if "memory" in err_str or "resource" in err_str:
-            return FailureType.RESOURCE
-        if "connection" in err_str or "network" in err_str:
-            return FailureType.NETWORK
-        if "dependency" in err_str or "import" in err_str:
-            return FailureType.DEPENDENCY
-        return FailureType.UNKNOWN
+        for exc_type, failure_type in _FAILURE_BY_TYPE:
+            if isinstance(error, exc_type):
+                return failure_type
+        best = 0
+        for m in _FAILURE_PATTERN.finditer(str(error)):
+            if m.lastindex == 1:
+                return FailureType.TIMEOUT
+            if not best or m.lastindex < best:
+                best = m.lastindex
+        return _FAILURE_BY_GROUP[best]
 
     async def _attempt_recovery(self, incident: IncidentRecord, error: Exception):
         strategy = self.recovery_strategies.get(incident.failure_type)
@@ -174,30 +267,55 @@ class SelfHealingEngine:
                 logger.error(f"Recovery failed for {incident.incident_id}: {re}")
 
     async def _health_loop(self):
+        # Sleep until the next check is due instead of polling on a fixed tick
+        max_sleep = self.config.get("health_poll_max", 30.0)
         while self._running:
-            for name, check in self.health_checks.items():
-                if time.time() - check.last_check < check.interval:
-                    continue
-                check.last_check = time.time()
-                if check.check_fn:
-                    try:
-                        await asyncio.wait_for(check.check_fn(), timeout=check.timeout)
-                        check.healthy = True
-                        check.consecutive_failures = 0
-                    except Exception:
-                        check.consecutive_failures += 1
-                        if check.consecutive_failures >= 3:
-                            check.healthy = False
-                            logger.warning(f"Health check failed: {name}")
-            await asyncio.sleep(5)
+            self._checks_changed.clear()
+            now = time.time()
+            next_due = now + max_sleep
+            due = self._due
+            try:
+                ready = []
+                while due and due[0][0] <= now:
+                    _, seq, check = heapq.heappop(due)
+                    if self._scheduled.get(check.name) == seq:
+                        ready.append(check)  # else replaced by a later registration
+                for check in ready:
+                    check.last_check = now
+                    self._schedule(check, now + check.interval)
+                    if check.check_fn:
+                        try:
+                            await asyncio.wait_for(check.check_fn(), timeout=check.timeout)
+                            check.healthy = True
+                            check.consecutive_failures = 0
+                        except Exception:
+                            check.consecutive_failures += 1
+                            if check.consecutive_failures >= 3:
+                                check.healthy = False
+                                logger.warning(f"Health check failed: {check.name}")
+            except Exception as e:
+                logger.error(f"Health loop error: {e}")
+            if due:
+                next_due = min(next_due, due[0][0])
+            try:
+                await asyncio.wait_for(
+                    self._checks_changed.wait(), timeout=max(1.0, next_due - time.time())
+                )
+            except asyncio.TimeoutError:
+                pass
 
     async def start(self):
         self._running = True
-        asyncio.create_task(self._health_loop())
+        self._health_task = asyncio.create_task(
+            self._health_loop(), name="ark95x.self_healing.health")
         logger.info("Self-healing engine active")
 
     async def stop(self):
         self._running = False
+        if self._health_task:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
 
     def get_report(self) -> Dict[str, Any]:
         return {
@@ -210,5 +328,5 @@ class SelfHealingEngine:
                 for k, v in self.health_checks.items()
             },
             "incidents_total": len(self.incidents),
-            "incidents_resolved": sum(1 for i in self.incidents if i.resolved),
+            "incidents_resolved": self._resolved_count,
         }
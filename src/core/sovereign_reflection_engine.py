@@ -75,6 +75,13 @@ STRATEGIC_EXECUTION_FRAMEWORK = [
      "weight": 1.0}},
 ]
 
+FRAMEWORK_CATEGORIES = tuple(next(iter(q)) for q in STRATEGIC_EXECUTION_FRAMEWORK)
+FRAMEWORK_WEIGHTS = tuple(next(iter(q.values())).get("weight", 1.0)
+                          for q in STRATEGIC_EXECUTION_FRAMEWORK)
+FRAMEWORK_QUESTIONS = "\n".join(
+    f"{i+1}. {cat.upper()}: {q[cat]['check']}"
+    for i, (cat, q) in enumerate(zip(FRAMEWORK_CATEGORIES, STRATEGIC_EXECUTION_FRAMEWORK)))
+
 
 @dataclass
 class StrategyEntry:
@@ -239,9 +246,7 @@ class SovereignReflectionEngine:
         return cycle
 
     def _build_reflection_prompt(self, summary, output, strategies):
-        questions = "\n".join([
-            f"{i+1}. {list(q.keys())[0].upper()}: {list(q.values())[0]['check']}"
-            for i, q in enumerate(STRATEGIC_EXECUTION_FRAMEWORK)])
+        questions = FRAMEWORK_QUESTIONS
         return f"""You are a self-evaluating AI agent. Score yourself 0-10 on each question.
 Return JSON: {{"scores": {{"q1": N, ...}}, "reasoning": {{"q1": "...", ...}}}}
 
@@ -266,8 +271,7 @@ Respond ONLY with valid JSON."""
                 "reasoning": {f"q{i+1}": "Baseline - no LLM connected" for i in range(10)}}
 
     def _compute_weighted_average(self, scores: Dict) -> float:
-        weights = [list(q.values())[0].get("weight", 1.0)
-                   for q in STRATEGIC_EXECUTION_FRAMEWORK]
+        weights = FRAMEWORK_WEIGHTS
         total_w, total_s = 0.0, 0.0
         for i, (key, score) in enumerate(scores.items()):
             w = weights[i] if i < len(weights) else 1.0
@@ -294,7 +298,7 @@ Respond ONLY with valid JSON."""
 
     def _generate_prompt_patch(self, scores: Dict, reasoning: Dict) -> str:
         patches = []
-        categories = [list(q.keys())[0] for q in STRATEGIC_EXECUTION_FRAMEWORK]
+        categories = FRAMEWORK_CATEGORIES
         for i, (key, score) in enumerate(scores.items()):
             if float(score) < self.score_threshold:
                 cat = categories[i] if i < len(categories) else "unknown"
@@ -306,7 +310,7 @@ Respond ONLY with valid JSON."""
     def _extract_strategies(self, cycle, scores, reasoning):
         for i, (key, score) in enumerate(scores.items()):
             if float(score) >= 7.0:
-                cats = [list(q.keys())[0] for q in STRATEGIC_EXECUTION_FRAMEWORK]
+                cats = FRAMEWORK_CATEGORIES
                 cat = cats[i] if i < len(cats) else "general"
                 sid = hashlib.md5(
                     f"{cycle.cycle_id}_{key}".encode()).hexdigest()[:12]
@@ -369,10 +373,12 @@ if __name__ == "__main__":
     cycle = engine.reflect(
         task_summary="Test task: verify reflection engine",
         task_output="Engine initialized and running baseline scores")
-    print(f"Cycle: {cycle.cycle_id}")
-    print(f"Weighted Avg: {cycle.weighted_average}")
-    print(f"Health: {cycle.execution_health}")
-    print(f"Decision: {cycle.autonomy_decision}")
     audit = engine.generate_strategic_audit(cycle.scores)
-    print(f"Audit: {audit.factors_passing}/{audit.total_factors} passing")
-    print(f"Audit Health: {audit.health.value}")
+    print("\n".join([
+        f"Cycle: {cycle.cycle_id}",
+        f"Weighted Avg: {cycle.weighted_average}",
+        f"Health: {cycle.execution_health}",
+        f"Decision: {cycle.autonomy_decision}",
+        f"Audit: {audit.factors_passing}/{audit.total_factors} passing",
+        f"Audit Health: {audit.health.value}",
+    ]))
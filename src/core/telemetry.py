@@ -2,10 +2,13 @@
 Real-time metrics collection, aggregation, and
 performance monitoring with time-series storage.
 """
+import asyncio
 import time
 import logging
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
+from array import array
+from bisect import bisect_left
 from collections import deque
 from enum import Enum
 
@@ -19,7 +22,7 @@ class MetricType(Enum):
     TIMER = "timer"
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricPoint:
     name: str
     value: float
@@ -30,32 +33,133 @@ class MetricPoint:
 
 @dataclass
 class MetricSeries:
+    """Column-oriented series: parallel timestamp/value ring buffers.
+
+    Per-point labels are rare, so they live in a sidecar dict keyed by
+    write sequence instead of on every point. Sum, min and max over the
+    retained points are kept up to date on append; min/max use
+    monotonic queues of (value, seq).
+    """
     name: str
     metric_type: MetricType
-    points: deque = field(default_factory=lambda: deque(maxlen=10000))
     labels: Dict[str, str] = field(default_factory=dict)
+    retention: int = 10000
+    _ts: array = field(init=False, repr=False)
+    _vals: array = field(init=False, repr=False)
+    _head: int = field(init=False, repr=False, default=0)
+    _size: int = field(init=False, repr=False, default=0)
+    _point_labels: Dict[int, Dict[str, str]] = field(init=False, repr=False, default_factory=dict)
+    _seq: int = field(init=False, repr=False, default=0)
+    _sum: float = field(init=False, repr=False, default=0.0)
+    _min_q: deque = field(init=False, repr=False, default_factory=deque)
+    _max_q: deque = field(init=False, repr=False, default_factory=deque)
+    # Alert levels, copied from the collector so writes skip the lookup
+    _warn: Optional[float] = field(init=False, repr=False, default=None)
+    _crit: Optional[float] = field(init=False, repr=False, default=None)
+
+    def __post_init__(self):
+        self._ts = array("d", bytes(8 * self.retention))
+        self._vals = array("d", bytes(8 * self.retention))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value: float, timestamp: float, labels: Optional[Dict[str, str]] = None) -> None:
+        value = float(value)  # min/max/latest all report floats, like the array
+        cap, seq = self.retention, self._seq
+        min_q, max_q = self._min_q, self._max_q
+        if self._size < cap:
+            i = self._size
+            self._size += 1
+        else:
+            i = self._head
+            self._head = (i + 1) % cap
+            self._sum -= self._vals[i]
+            evicted = seq - cap
+            if min_q[0][1] == evicted:
+                min_q.popleft()
+            if max_q[0][1] == evicted:
+                max_q.popleft()
+            if self._point_labels:
+                self._point_labels.pop(evicted, None)
+        self._ts[i] = timestamp
+        self._vals[i] = value
+        if i == cap - 1 and self._head == 0:
+            # Resync once per lap so float drift can't accumulate
+            self._sum = sum(self._vals)
+        else:
+            self._sum += value
+        while min_q and min_q[-1][0] >= value:
+            min_q.pop()
+        min_q.append((value, seq))
+        while max_q and max_q[-1][0] <= value:
+            max_q.pop()
+        max_q.append((value, seq))
+        if labels:
+            self._point_labels[seq] = labels
+        self._seq = seq + 1
+
+    def _last(self, buf: array, n: int) -> array:
+        """The newest n entries of a ring buffer, oldest first."""
+        start = (self._head + self._size - n) % self.retention
+        stop = start + n
+        if stop <= self.retention:
+            return buf[start:stop]
+        return buf[start:] + buf[:stop - self.retention]
+
+    def recent(self, cutoff: float) -> array:
+        """Values with timestamp >= cutoff, oldest first.
+
+        Timestamps are appended in order, so each physical half of the
+        ring is sorted and the window start is found by bisection.
+        """
+        ts, cap, head, size = self._ts, self.retention, self._head, self._size
+        if size < cap or head == 0:
+            n = size - bisect_left(ts, cutoff, 0, size)
+        elif cutoff <= ts[cap - 1]:
+            # Window starts in the older half [head, cap) and spans the newer one
+            n = cap - bisect_left(ts, cutoff, head, cap) + head
+        else:
+            n = head - bisect_left(ts, cutoff, 0, head)
+        return self._last(self._vals, n)
+
+    @property
+    def points(self) -> List[MetricPoint]:
+        """Materialized points, oldest first."""
+        first = self._seq - self._size
+        get = self._point_labels.get
+        return [
+            MetricPoint(self.name, v, ts, dict(get(first + i) or ()), self.metric_type)
+            for i, (ts, v) in enumerate(zip(
+                self._last(self._ts, self._size), self._last(self._vals, self._size)))
+        ]
 
     @property
     def latest(self) -> Optional[float]:
-        return self.points[-1].value if self.points else None
+        if not self._size:
+            return None
+        return self._vals[(self._head + self._size - 1) % self.retention]
 
     @property
     def avg(self) -> float:
-        if not self.points:
-            return 0.0
-        return sum(p.value for p in self.points) / len(self.points)
+        return self._sum / self._size if self._size else 0.0
 
     @property
     def min_val(self) -> float:
-        return min((p.value for p in self.points), default=0.0)
+        return self._min_q[0][0] if self._min_q else 0.0
 
     @property
     def max_val(self) -> float:
-        return max((p.value for p in self.points), default=0.0)
+        return self._max_q[0][0] if self._max_q else 0.0
 
 
 class TelemetryCollector:
-    """Centralized metrics collection and aggregation."""
+    """Centralized metrics collection and aggregation.
+
+    With ``buffered_writes`` enabled, writes only land in a preallocated
+    ring and are applied to the series by ``flush()``: from the drain task
+    started by ``start()``, when the ring fills, or before any read.
+    """
 
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
@@ -63,77 +167,162 @@ class TelemetryCollector:
         self.alerts: List[Dict[str, Any]] = []
         self._thresholds: Dict[str, Dict] = {}
         self._retention = self.config.get("retention_points", 10000)
+        # One shared dict per distinct label set, bounded against high cardinality
+        self._label_intern: Dict[tuple, Dict[str, str]] = {}
+        self._label_intern_max = self.config.get("label_intern_max", 10000)
+        self._buffered = self.config.get("buffered_writes", False)
+        self._flush_interval = self.config.get("flush_interval", 0.5)
+        self._drain_task: Optional[asyncio.Task] = None
+        if self._buffered:
+            cap = self.config.get("write_buffer", 65536)
+            self._wb_cap = cap
+            self._wb_ts = array("d", bytes(8 * cap))
+            self._wb_val = array("d", bytes(8 * cap))
+            self._wb_type: List[Optional[MetricType]] = [None] * cap
+            self._wb_name: List[Optional[str]] = [None] * cap
+            self._wb_labels: List[Optional[Dict[str, str]]] = [None] * cap
+            self._wb_head = 0
+            self._wb_tail = 0
 
     def _get_or_create(self, name: str, metric_type: MetricType) -> MetricSeries:
-        if name not in self.series:
-            self.series[name] = MetricSeries(
-                name=name, metric_type=metric_type,
-                points=deque(maxlen=self._retention)
+        s = self.series.get(name)
+        if s is None:
+            s = self.series[name] = MetricSeries(
+                name=name, metric_type=metric_type, retention=self._retention
             )
-        return self.series[name]
+            t = self._thresholds.get(name)
+            if t:
+                s._warn, s._crit = t["warn"], t["critical"]
+        return s
 
     def increment(self, name: str, value: float = 1.0, **labels):
-        s = self._get_or_create(name, MetricType.COUNTER)
-        current = s.latest or 0.0
-        point = MetricPoint(name=name, value=current + value, labels=labels, metric_type=MetricType.COUNTER)
-        s.points.append(point)
-        self._check_threshold(name, point.value)
+        self._write(MetricType.COUNTER, name, value, labels)
 
     def gauge(self, name: str, value: float, **labels):
-        s = self._get_or_create(name, MetricType.GAUGE)
-        point = MetricPoint(name=name, value=value, labels=labels, metric_type=MetricType.GAUGE)
-        s.points.append(point)
-        self._check_threshold(name, value)
+        self._write(MetricType.GAUGE, name, value, labels)
 
     def timer(self, name: str, duration: float, **labels):
-        s = self._get_or_create(name, MetricType.TIMER)
-        point = MetricPoint(name=name, value=duration, labels=labels, metric_type=MetricType.TIMER)
-        s.points.append(point)
-        self._check_threshold(name, duration)
+        self._write(MetricType.TIMER, name, duration, labels)
 
     def histogram(self, name: str, value: float, **labels):
-        s = self._get_or_create(name, MetricType.HISTOGRAM)
-        point = MetricPoint(name=name, value=value, labels=labels, metric_type=MetricType.HISTOGRAM)
-        s.points.append(point)
+        self._write(MetricType.HISTOGRAM, name, value, labels)
+
+    def _intern_labels(self, labels: Dict[str, str]) -> Dict[str, str]:
+        try:
+            key = tuple(sorted(labels.items()))
+            shared = self._label_intern.get(key)
+        except TypeError:  # unhashable or unorderable label values
+            return labels
+        if shared is None:
+            if len(self._label_intern) >= self._label_intern_max:
+                return labels
+            shared = self._label_intern[key] = labels
+        return shared
+
+    def _write(self, metric_type: MetricType, name: str, value: float, labels: Dict[str, str]):
+        labels = self._intern_labels(labels) if labels else None
+        if not self._buffered:
+            self._apply(metric_type, name, value, time.time(), labels)
+            return
+        if self._wb_head - self._wb_tail == self._wb_cap:
+            self.flush()
+        i = self._wb_head % self._wb_cap
+        self._wb_ts[i] = time.time()
+        self._wb_val[i] = value
+        self._wb_type[i] = metric_type
+        self._wb_name[i] = name
+        self._wb_labels[i] = labels
+        self._wb_head += 1
+
+    def _apply(self, metric_type: MetricType, name: str, value: float,
+               now: float, labels: Optional[Dict[str, str]]):
+        s = self._get_or_create(name, metric_type)
+        if metric_type is MetricType.COUNTER:
+            value = (s.latest or 0.0) + value
+        s.append(value, now, labels)
+        if (s._warn or s._crit) and metric_type is not MetricType.HISTOGRAM:
+            self._check_threshold(s, value, now)
+
+    def flush(self) -> int:
+        """Apply buffered writes in order; returns how many were applied."""
+        if not self._buffered:
+            return 0
+        tail, head, cap = self._wb_tail, self._wb_head, self._wb_cap
+        types, names, labels = self._wb_type, self._wb_name, self._wb_labels
+        for n in range(tail, head):
+            i = n % cap
+            self._apply(types[i], names[i], self._wb_val[i], self._wb_ts[i], labels[i])
+            labels[i] = None
+        self._wb_tail = head
+        return head - tail
+
+    async def _drain_loop(self):
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Telemetry flush error: {e}")
+
+    async def start(self):
+        if self._buffered and self._drain_task is None:
+            self._drain_task = asyncio.create_task(
+                self._drain_loop(), name="ark95x.telemetry.drain")
+
+    async def stop(self):
+        if self._drain_task:
+            self._drain_task.cancel()
+            await asyncio.gather(self._drain_task, return_exceptions=True)
+            self._drain_task = None
+        self.flush()
 
     def set_threshold(self, name: str, warn: Optional[float] = None, critical: Optional[float] = None):
         self._thresholds[name] = {"warn": warn, "critical": critical}
+        s = self.series.get(name)
+        if s is not None:
+            s._warn, s._crit = warn, critical
 
-    def _check_threshold(self, name: str, value: float):
-        t = self._thresholds.get(name)
-        if not t:
-            return
-        if t.get("critical") and value >= t["critical"]:
-            alert = {"metric": name, "value": value, "level": "critical", "time": time.time()}
+    def _check_threshold(self, s: MetricSeries, value: float, now: float):
+        crit, warn = s._crit, s._warn
+        if crit and value >= crit:
+            alert = {"metric": s.name, "value": value, "level": "critical", "time": now}
             self.alerts.append(alert)
-            logger.critical(f"ALERT [{name}]: {value} >= {t['critical']}")
-        elif t.get("warn") and value >= t["warn"]:
-            alert = {"metric": name, "value": value, "level": "warning", "time": time.time()}
+            logger.critical(f"ALERT [{s.name}]: {value} >= {crit}")
+        elif warn and value >= warn:
+            alert = {"metric": s.name, "value": value, "level": "warning", "time": now}
             self.alerts.append(alert)
-            logger.warning(f"WARN [{name}]: {value} >= {t['warn']}")
+            logger.warning(f"WARN [{s.name}]: {value} >= {warn}")
 
     def get_snapshot(self, window_seconds: float = 60.0) -> Dict[str, Any]:
+        self.flush()
         cutoff = time.time() - window_seconds
         snapshot = {}
         for name, s in self.series.items():
-            recent = [p for p in s.points if p.timestamp >= cutoff]
-            if recent:
-                values = [p.value for p in recent]
-                snapshot[name] = {
-                    "type": s.metric_type.value,
-                    "count": len(recent),
-                    "latest": values[-1],
-                    "avg": sum(values) / len(values),
-                    "min": min(values),
-                    "max": max(values),
-                }
+            values = s.recent(cutoff)
+            if not values:
+                continue
+            if len(values) == len(s):
+                # Window covers the whole series: use the running aggregates
+                avg, lo, hi = s.avg, s.min_val, s.max_val
+            else:
+                avg, lo, hi = sum(values) / len(values), min(values), max(values)
+            snapshot[name] = {
+                "type": s.metric_type.value,
+                "count": len(values),
+                "latest": values[-1],
+                "avg": avg,
+                "min": lo,
+                "max": hi,
+            }
         return snapshot
 
     def get_dashboard(self) -> Dict[str, Any]:
+        self.flush()
+        alert_cutoff = time.time() - 300
         return {
             "total_series": len(self.series),
-            "total_points": sum(len(s.points) for s in self.series.values()),
-            "active_alerts": len([a for a in self.alerts if time.time() - a["time"] < 300]),
+            "total_points": sum(len(s) for s in self.series.values()),
+            "active_alerts": sum(1 for a in self.alerts if a["time"] > alert_cutoff),
             "metrics": {
                 name: {"latest": s.latest, "avg": s.avg, "type": s.metric_type.value}
                 for name, s in self.series.items()
@@ -7,12 +7,33 @@ Privacy-first with cost optimization and offline fallback.
 """
 
 import asyncio
+import hashlib
+import logging
 import time
 import json
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, ClassVar
+from dataclasses import dataclass, field, replace
 from enum import Enum
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if aiohttp is not None:
+    _LOCAL_TIMEOUT = aiohttp.ClientTimeout(total=120)
+    _CLOUD_TIMEOUT = aiohttp.ClientTimeout(total=60)
+
+_now = time.perf_counter
+
+logger = logging.getLogger("ark95x.models.router")
+
 
 class RoutingStrategy(Enum):
     LOCAL_FIRST = "local_first"
@@ -47,9 +68,15 @@ class ModelEndpoint:
     is_local: bool = False
     is_available: bool = True
     avg_latency_ms: float = 0.0
+    avg_latency_initialized: bool = False
+    # avg_latency_ms when the router last ranked endpoints
+    ranked_latency_ms: float = 0.0
     total_requests: int = 0
     error_count: int = 0
 
+    # EMA weight for new latency samples; older samples decay geometrically
+    ALPHA: ClassVar[float] = 0.125
+
 
 class HybridModelRouter:
     """Routes inference between local and cloud models."""
@@ -57,9 +84,17 @@ class HybridModelRouter:
     def __init__(self, ollama_host: str = "http://localhost:11434"):
         self.ollama_host = ollama_host.rstrip("/")
         self.endpoints: Dict[str, ModelEndpoint] = {}
-        self.response_cache: Dict[str, RoutingResult] = {}
+        # LRU of cache_key -> (stored_at monotonic, result), oldest first
+        self.response_cache: "OrderedDict[str, Tuple[float, RoutingResult]]" = OrderedDict()
         self.cache_ttl = 300  # 5 min TTL
+        self.cache_max_entries = 10_000
         self.default_strategy = RoutingStrategy.LOCAL_FIRST
+        self._session = None  # aiohttp.ClientSession, created on first use
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # (endpoint name, cache key) -> task running the request already in flight
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        # (local, cloud) endpoints by (cost, latency); None means rebuild
+        self._ranked: Optional[Tuple[List[ModelEndpoint], List[ModelEndpoint]]] = None
         self._init_local_endpoints()
 
     def _init_local_endpoints(self) -> None:
@@ -82,6 +117,7 @@ class HybridModelRouter:
                 cost_per_1k_tokens=0.0,
                 is_local=True,
             )
+        self._ranked = None
 
     def register_cloud_endpoint(
         self, name: str, provider: str, api_key: str,
@@ -102,6 +138,21 @@ class HybridModelRouter:
             cost_per_1k_tokens=cost_per_1k,
             is_local=False,
         )
+        self._ranked = None
+
+    def _ranked_endpoints(self) -> Tuple[List[ModelEndpoint], List[ModelEndpoint]]:
+        if self._ranked is None:
+            ranked = sorted(
+                self.endpoints.values(),
+                key=lambda e: (e.cost_per_1k_tokens, e.avg_latency_ms),
+            )
+            for e in ranked:
+                e.ranked_latency_ms = e.avg_latency_ms
+            self._ranked = (
+                [e for e in ranked if e.is_local],
+                [e for e in ranked if not e.is_local],
+            )
+        return self._ranked
 
     def should_use_local(self, requirements: Dict[str, Any]) -> bool:
         """Determine if local processing is preferred."""
@@ -113,40 +164,29 @@ class HybridModelRouter:
         if isinstance(strategy, str):
             strategy = RoutingStrategy(strategy)
 
-        if strategy == RoutingStrategy.PRIVACY_REQUIRED:
+        if strategy is RoutingStrategy.PRIVACY_REQUIRED:
             return True
-        if strategy == RoutingStrategy.CLOUD_FIRST:
+        if strategy is RoutingStrategy.CLOUD_FIRST:
             return False
         if privacy or offline:
             return True
-        if strategy == RoutingStrategy.COST_OPTIMIZED and budget < 0.05:
+        if strategy is RoutingStrategy.COST_OPTIMIZED and budget < 0.05:
             return True
-        return strategy == RoutingStrategy.LOCAL_FIRST
+        return strategy is RoutingStrategy.LOCAL_FIRST
 
     def select_endpoint(self, requirements: Dict[str, Any]) -> Optional[ModelEndpoint]:
         """Select best endpoint based on requirements."""
         use_local = self.should_use_local(requirements)
         task_type = requirements.get("task_type", "general")
 
-        candidates = [
-            ep for ep in self.endpoints.values()
-            if ep.is_available and ep.is_local == use_local
-        ]
-
-        if not candidates:
-            # Fallback: try opposite locality
-            candidates = [
-                ep for ep in self.endpoints.values() if ep.is_available
-            ]
-
-        if not candidates:
-            return None
-
-        # Sort: prefer lower cost, then lower latency
-        candidates.sort(
-            key=lambda e: (e.cost_per_1k_tokens, e.avg_latency_ms)
-        )
-        return candidates[0]
+        # Pre-sorted by lower cost, then lower latency; fall back to the
+        # opposite locality when nothing preferred is available
+        local, cloud = self._ranked_endpoints()
+        for group in ((local, cloud) if use_local else (cloud, local)):
+            for ep in group:
+                if ep.is_available:
+                    return ep
+        return None
 
     async def route_request(
         self, prompt: str, requirements: Dict[str, Any]
@@ -154,10 +194,16 @@ class HybridModelRouter:
         """Route request to optimal model."""
         # Check cache
         cache_key = self._cache_key(prompt, requirements)
-        cached = self.response_cache.get(cache_key)
-        if cached and not requirements.get("no_cache", False):
-            cached.cached = True
-            return cached
+        no_cache = requirements.get("no_cache", False)
+        if not no_cache:
+            entry = self.response_cache.get(cache_key)
+            if entry:
+                if time.monotonic() - entry[0] < self.cache_ttl:
+                    self.response_cache.move_to_end(cache_key)
+                    cached = entry[1]
+                    cached.cached = True
+                    return cached
+                del self.response_cache[cache_key]
 
         endpoint = self.select_endpoint(requirements)
         if not endpoint:
@@ -166,33 +212,126 @@ class HybridModelRouter:
                 error="No available endpoints"
             )
 
-        if endpoint.is_local:
-            result = await self._execute_local(endpoint, prompt, requirements)
-        else:
-            result = await self._execute_cloud(endpoint, prompt, requirements)
+        # Identical requests already in flight share that call's result
+        if no_cache:
+            return await self._dispatch(endpoint, prompt, requirements, cache_key)
+        key = (endpoint.name, cache_key)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return replace(await asyncio.shield(pending), cached=True)
+
+        # The call runs in its own task, so cancelling the caller that started
+        # it doesn't cancel the callers that joined it
+        task = asyncio.create_task(
+            self._dispatch(endpoint, prompt, requirements, cache_key, key),
+            name="ark95x.router.request",
+        )
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _dispatch(
+        self, endpoint: ModelEndpoint, prompt: str, requirements: Dict[str, Any],
+        cache_key: str, inflight_key: Optional[Tuple[str, str]] = None,
+    ) -> RoutingResult:
+        """Execute on the endpoint, then record metrics and cache the result."""
+        try:
+            if endpoint.is_local:
+                result = await self._execute_local(endpoint, prompt, requirements)
+            else:
+                result = await self._execute_cloud(endpoint, prompt, requirements)
+        finally:
+            if inflight_key is not None:
+                self._inflight.pop(inflight_key, None)
 
         # Update metrics
         endpoint.total_requests += 1
         if result.success:
             prev = endpoint.avg_latency_ms
-            n = endpoint.total_requests
-            endpoint.avg_latency_ms = prev + (result.latency_ms - prev) / n
+            if endpoint.avg_latency_initialized:
+                endpoint.avg_latency_ms = prev + endpoint.ALPHA * (result.latency_ms - prev)
+            else:
+                endpoint.avg_latency_ms = result.latency_ms
+                endpoint.avg_latency_initialized = True
+            # Re-rank once latency drifts >10% from what the ranking used
+            ranked_at = endpoint.ranked_latency_ms
+            if abs(endpoint.avg_latency_ms - ranked_at) > 0.1 * ranked_at:
+                self._ranked = None
         else:
             endpoint.error_count += 1
 
         # Cache successful results
         if result.success:
-            self.response_cache[cache_key] = result
+            cache = self.response_cache
+            cache[cache_key] = (time.monotonic(), result)
+            cache.move_to_end(cache_key)
+            if len(cache) > self.cache_max_entries:
+                cache.popitem(last=False)
 
         return result
 
+    async def _get_session(self):
+        """Shared keep-alive session, recreated when used from a different loop."""
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for model requests")
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            if self._session is not None and not self._session.closed:
+                self._release_stale_session()
+            self._session_loop = loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100, limit_per_host=16, ttl_dns_cache=300
+                )
+            )
+        return self._session
+
+    def _release_stale_session(self) -> None:
+        """Close a session left behind on another event loop."""
+        session, old_loop = self._session, self._session_loop
+        if old_loop is not None and old_loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), old_loop)
+            logger.info("Router session closed on its original event loop")
+            return
+        # The owning loop is gone; detach and drop the connector's sockets
+        # directly since nothing can await session.close() there any more
+        connector = session.connector
+        session.detach()
+        if connector is not None:
+            connector._close()
+        logger.warning("Router session abandoned by a finished event loop; connector closed")
+
+    async def close(self) -> None:
+        if self._session is not None:
+            if self._session_loop is asyncio.get_running_loop():
+                await self._session.close()
+            elif not self._session.closed:
+                self._release_stale_session()
+            self._session = None
+            self._session_loop = None
+
+    async def warmup(self, model_name: str) -> bool:
+        """Ask Ollama to load a local model so the first request skips the load."""
+        endpoint = self.endpoints.get(model_name)
+        if not endpoint or not endpoint.is_local or not endpoint.is_available:
+            return False
+        try:
+            session = await self._get_session()
+            # A generate call with no prompt only loads the model
+            async with session.post(
+                endpoint.endpoint,
+                json={"model": endpoint.model_id},
+                timeout=_LOCAL_TIMEOUT,
+            ) as resp:
+                return resp.status == 200
+        except Exception:
+            return False
+
     async def _execute_local(
         self, endpoint: ModelEndpoint, prompt: str, req: Dict[str, Any]
     ) -> RoutingResult:
         """Execute via Ollama local API."""
-        start = time.time()
+        start = _now()
         try:
-            import aiohttp
             payload = {
                 "model": endpoint.model_id,
                 "prompt": prompt,
@@ -205,21 +344,21 @@ class HybridModelRouter:
             if req.get("system_prompt"):
                 payload["system"] = req["system_prompt"]
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    endpoint.endpoint,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=120),
-                ) as resp:
-                    if resp.status != 200:
-                        return RoutingResult(
-                            success=False, provider="local",
-                            model=endpoint.model_id,
-                            error=f"Ollama returned {resp.status}",
-                        )
-                    data = await resp.json()
-
-            latency = (time.time() - start) * 1000
+            session = await self._get_session()
+            async with session.post(
+                endpoint.endpoint,
+                json=payload,
+                timeout=_LOCAL_TIMEOUT,
+            ) as resp:
+                if resp.status != 200:
+                    return RoutingResult(
+                        success=False, provider="local",
+                        model=endpoint.model_id,
+                        error=f"Ollama returned {resp.status}",
+                    )
+                data = await resp.json()
+
+            latency = (_now() - start) * 1000
             return RoutingResult(
                 success=True,
                 provider="local",
@@ -230,7 +369,7 @@ class HybridModelRouter:
                 latency_ms=latency,
             )
         except Exception as e:
-            latency = (time.time() - start) * 1000
+            latency = (_now() - start) * 1000
             return RoutingResult(
                 success=False, provider="local",
                 model=endpoint.model_id,
@@ -241,9 +380,8 @@ class HybridModelRouter:
         self, endpoint: ModelEndpoint, prompt: str, req: Dict[str, Any]
     ) -> RoutingResult:
         """Execute via cloud API."""
-        start = time.time()
+        start = _now()
         try:
-            import aiohttp
             headers = {
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {endpoint.api_key}",
@@ -259,21 +397,21 @@ class HybridModelRouter:
                     0, {"role": "system", "content": req["system_prompt"]}
                 )
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    endpoint.endpoint, json=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=60),
-                ) as resp:
-                    if resp.status != 200:
-                        return RoutingResult(
-                            success=False, provider="cloud",
-                            model=endpoint.model_id,
-                            error=f"Cloud API returned {resp.status}",
-                        )
-                    data = await resp.json()
-
-            latency = (time.time() - start) * 1000
+            session = await self._get_session()
+            async with session.post(
+                endpoint.endpoint, json=payload,
+                headers=headers,
+                timeout=_CLOUD_TIMEOUT,
+            ) as resp:
+                if resp.status != 200:
+                    return RoutingResult(
+                        success=False, provider="cloud",
+                        model=endpoint.model_id,
+                        error=f"Cloud API returned {resp.status}",
+                    )
+                data = await resp.json()
+
+            latency = (_now() - start) * 1000
             response_text = ""
             tokens = 0
             if "choices" in data:
@@ -291,7 +429,7 @@ class HybridModelRouter:
                 latency_ms=latency,
             )
         except Exception as e:
-            latency = (time.time() - start) * 1000
+            latency = (_now() - start) * 1000
             return RoutingResult(
                 success=False, provider="cloud",
                 model=endpoint.model_id,
@@ -299,9 +437,16 @@ class HybridModelRouter:
             )
 
     def _cache_key(self, prompt: str, req: Dict[str, Any]) -> str:
-        import hashlib
-        raw = f"{prompt}:{json.dumps(req, sort_keys=True)}"
-        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+        if orjson is not None:
+            # Match json.dumps(default=str): stringify keys and unknown objects
+            raw = prompt.encode() + b":" + orjson.dumps(
+                req, default=str,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            )
+        else:
+            raw = f"{prompt}:{json.dumps(req, sort_keys=True, default=str)}".encode()
+        # Cache lookup key, not a signature; an 8-byte BLAKE2b digest is plenty
+        return hashlib.blake2b(raw, digest_size=8).hexdigest()
 
     def get_status(self) -> Dict[str, Any]:
         local = [e for e in self.endpoints.values() if e.is_local]
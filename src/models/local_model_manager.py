@@ -6,9 +6,13 @@ Manages local model registry, capability matching, and task-to-model selection.
 Designed for sovereign processing with Ollama-hosted models.
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple, FrozenSet
 from dataclasses import dataclass, field
 from enum import Enum
+from operator import itemgetter
+import heapq
+import sys
 import time
 
 
@@ -27,11 +31,16 @@ class Performance(Enum):
     ULTRA = "ultra"
 
 
-@dataclass
+PERF_SCORES: Dict[Performance, int] = {
+    Performance.ULTRA: 4, Performance.HIGH: 3, Performance.MEDIUM: 2, Performance.LOW: 1,
+}
+
+
+@dataclass(slots=True)
 class ModelSpec:
     name: str
     model_type: ModelType
-    capabilities: List[str]
+    capabilities: Tuple[str, ...]
     hardware_req: str
     performance: Performance
     use_case: str
@@ -42,12 +51,32 @@ class ModelSpec:
     last_used: float = 0.0
     total_requests: int = 0
     avg_latency_ms: float = 0.0
+    # Derived lookup forms for task matching
+    capabilities_set: FrozenSet[str] = field(init=False, repr=False)
+    hardware_req_lower: str = field(init=False, repr=False)
+    # Static scoring terms, kept separate so score sums stay in the same order
+    perf_score: int = field(init=False, repr=False)
+    perf_bonus: float = field(init=False, repr=False)
+    priority_bonus: float = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Intern the repeated registry strings so lookups compare by pointer
+        self.name = sys.intern(self.name)
+        self.capabilities = tuple(sys.intern(c) for c in self.capabilities)
+        self.hardware_req = sys.intern(self.hardware_req)
+        self.use_case = sys.intern(self.use_case)
+        self.ollama_tag = sys.intern(self.ollama_tag)
+        self.capabilities_set = frozenset(self.capabilities)
+        self.hardware_req_lower = sys.intern(self.hardware_req.lower())
+        self.perf_score = PERF_SCORES.get(self.performance, 0)
+        self.perf_bonus = self.perf_score * 0.5
+        self.priority_bonus = self.priority * 0.01
 
 
 DEFAULT_MODEL_REGISTRY: Dict[str, Dict[str, Any]] = {
     "deepseek-r1": {
         "model_type": ModelType.LANGUAGE,
-        "capabilities": ["reasoning", "analysis", "coding", "math", "planning"],
+        "capabilities": ("reasoning", "analysis", "coding", "math", "planning"),
         "hardware_req": "GPU 16GB+",
         "performance": Performance.ULTRA,
         "use_case": "deep_reasoning",
@@ -57,7 +86,7 @@ DEFAULT_MODEL_REGISTRY: Dict[str, Dict[str, Any]] = {
     },
     "llama3.1-70b": {
         "model_type": ModelType.LANGUAGE,
-        "capabilities": ["text_generation", "summarization", "qa", "reasoning", "coding"],
+        "capabilities": ("text_generation", "summarization", "qa", "reasoning", "coding"),
         "hardware_req": "GPU 48GB+",
         "performance": Performance.ULTRA,
         "use_case": "general_purpose",
@@ -67,7 +96,7 @@ DEFAULT_MODEL_REGISTRY: Dict[str, Dict[str, Any]] = {
     },
     "mixtral-8x7b": {
         "model_type": ModelType.LANGUAGE,
-        "capabilities": ["text_generation", "reasoning", "coding", "analysis"],
+        "capabilities": ("text_generation", "reasoning", "coding", "analysis"),
         "hardware_req": "GPU 24GB+",
         "performance": Performance.HIGH,
         "use_case": "technical_tasks",
@@ -77,7 +106,7 @@ DEFAULT_MODEL_REGISTRY: Dict[str, Dict[str, Any]] = {
     },
     "llama3.1-8b": {
         "model_type": ModelType.LANGUAGE,
-        "capabilities": ["text_generation", "summarization", "qa", "chat"],
+        "capabilities": ("text_generation", "summarization", "qa", "chat"),
         "hardware_req": "GPU 8GB+",
         "performance": Performance.MEDIUM,
         "use_case": "general_purpose",
@@ -87,7 +116,7 @@ DEFAULT_MODEL_REGISTRY: Dict[str, Dict[str, Any]] = {
     },
     "mistral-7b": {
         "model_type": ModelType.LANGUAGE,
-        "capabilities": ["reasoning", "coding", "analysis", "text_generation"],
+        "capabilities": ("reasoning", "coding", "analysis", "text_generation"),
         "hardware_req": "GPU 8GB+",
         "performance": Performance.HIGH,
         "use_case": "technical_tasks",
@@ -97,7 +126,7 @@ DEFAULT_MODEL_REGISTRY: Dict[str, Dict[str, Any]] = {
     },
     "phi3": {
         "model_type": ModelType.LANGUAGE,
-        "capabilities": ["text_generation", "qa", "chat"],
+        "capabilities": ("text_generation", "qa", "chat"),
         "hardware_req": "GPU 4GB+",
         "performance": Performance.MEDIUM,
         "use_case": "fast_inference",
@@ -107,7 +136,7 @@ DEFAULT_MODEL_REGISTRY: Dict[str, Dict[str, Any]] = {
     },
     "nomic-embed": {
         "model_type": ModelType.EMBEDDING,
-        "capabilities": ["embedding", "semantic_search", "clustering"],
+        "capabilities": ("embedding", "semantic_search", "clustering"),
         "hardware_req": "GPU 4GB+",
         "performance": Performance.HIGH,
         "use_case": "vector_operations",
@@ -123,81 +152,176 @@ class LocalModelManager:
 
     def __init__(self, custom_registry: Optional[Dict[str, Dict]] = None):
         self.models: Dict[str, ModelSpec] = {}
+        # Bumped on any change that can affect model selection
+        self.revision = 0
+        self._selection_cache: Dict[tuple, Optional[Tuple[str, float, ModelSpec]]] = {}
+        # Bumped on any change visible in get_inventory (includes usage stats)
+        self._inventory_version = 0
+        self._inventory_cache: Optional[Tuple[int, Dict[str, Dict[str, Any]]]] = None
         registry = custom_registry or DEFAULT_MODEL_REGISTRY
         for name, info in registry.items():
             self.models[name] = ModelSpec(name=name, **info)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        """Rebuild the capability/type indexes after the registry changes."""
+        self._position: Dict[str, int] = {}
+        self._by_capability: Dict[str, List[str]] = defaultdict(list)
+        self._by_type: Dict[ModelType, List[ModelSpec]] = defaultdict(list)
+        # Highest score any model could reach without a capability match
+        self._fallback_ceiling = float("-inf")
+        for i, (name, spec) in enumerate(self.models.items()):
+            self._position[name] = i
+            for cap in spec.capabilities_set:
+                self._by_capability[cap].append(name)
+            self._by_type[spec.model_type].append(spec)
+            ceiling = 2.0 + PERF_SCORES.get(spec.performance, 0) * 0.5 + 1.0 + spec.priority * 0.01 + 1.5
+            self._fallback_ceiling = max(self._fallback_ceiling, ceiling)
 
     def register_model(self, name: str, spec: ModelSpec) -> None:
         self.models[name] = spec
+        self.revision += 1
+        self._inventory_version += 1
+        self._reindex()
 
     def unregister_model(self, name: str) -> bool:
-        return self.models.pop(name, None) is not None
+        removed = self.models.pop(name, None) is not None
+        if removed:
+            self.revision += 1
+            self._inventory_version += 1
+            self._reindex()
+        return removed
+
+    def _score(
+        self, spec: ModelSpec, task_type: str, hardware: str,
+        min_context: int, required_score: int
+    ) -> Optional[float]:
+        # Hard filters
+        if spec.perf_score < required_score:
+            return None
+        fits = spec.context_window >= min_context
+        if not fits and min_context > 0:
+            return None  # Skip if context too small
+
+        # Capability match
+        caps = spec.capabilities_set
+        if task_type in caps:
+            cap = 3.0
+        elif task_type == "general" and "text_generation" in caps:
+            cap = 2.0
+        else:
+            cap = 0.0
+
+        # Capability + hardware + tier + context + priority + warm-model bonus
+        return (
+            cap
+            + 2.0 * (hardware in spec.hardware_req_lower)
+            + spec.perf_bonus
+            + 1.0 * fits
+            + spec.priority_bonus
+            + 1.5 * spec.loaded
+        )
 
     def get_best_model_for_task(
         self, task_requirements: Dict[str, Any]
     ) -> Optional[Tuple[str, float, ModelSpec]]:
-        """Select optimal local model based on task requirements."""
+        """Select optimal local model based on task requirements.
+
+        Capability matches come from the index; the remaining models are
+        only scored when one of them could still beat the best match.
+        Results are memoized until the next registry or load-state change.
+        """
         task_type = task_requirements.get("type", "general")
         hardware = task_requirements.get("hardware", "gpu").lower()
-        priority = task_requirements.get("priority", "normal")
         min_context = task_requirements.get("min_context_window", 0)
         required_perf = task_requirements.get("min_performance", None)
 
-        candidates: List[Tuple[str, float, ModelSpec]] = []
-
-        for name, spec in self.models.items():
-            score = 0.0
-
-            # Capability match
-            if task_type in spec.capabilities:
-                score += 3.0
-            elif task_type == "general" and "text_generation" in spec.capabilities:
-                score += 2.0
-
-            # Hardware compatibility
-            if hardware in spec.hardware_req.lower():
-                score += 2.0
-
-            # Performance tier
-            perf_scores = {Performance.ULTRA: 4, Performance.HIGH: 3, Performance.MEDIUM: 2, Performance.LOW: 1}
-            score += perf_scores.get(spec.performance, 0) * 0.5
-
-            # Context window check
-            if spec.context_window >= min_context:
-                score += 1.0
-            elif min_context > 0:
-                continue  # Skip if context too small
-
-            # Priority bonus
-            score += spec.priority * 0.01
-
-            # Recency bonus (recently used models are warm)
-            if spec.loaded:
-                score += 1.5
+        key = (task_type, hardware, min_context, required_perf, self.revision)
+        try:
+            return self._selection_cache[key]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable requirement values, skip the cache
+            key = None
+
+        result = self._select(task_type, hardware, min_context, required_perf)
+        if key is not None:
+            if len(self._selection_cache) >= 1024:
+                self._selection_cache.clear()
+            self._selection_cache[key] = result
+        return result
 
-            # Performance filter
-            if required_perf and perf_scores.get(spec.performance, 0) < perf_scores.get(Performance(required_perf), 0):
+    def _select(
+        self, task_type: str, hardware: str, min_context: int, required_perf: Optional[str]
+    ) -> Optional[Tuple[str, float, ModelSpec]]:
+        required_score = PERF_SCORES.get(Performance(required_perf), 0) if required_perf else 0
+
+        matched = set(self._by_capability.get(task_type, ()))
+        if task_type == "general":
+            matched.update(self._by_capability.get("text_generation", ()))
+
+        # Highest score wins; ties go to the earlier-registered model
+        position = self._position
+        best: Optional[Tuple[str, float, ModelSpec]] = None
+        best_pos = 0
+        for name in matched:
+            spec = self.models[name]
+            score = self._score(spec, task_type, hardware, min_context, required_score)
+            if score is None or score <= 0:
                 continue
+            pos = position[name]
+            if best is None or score > best[1] or (score == best[1] and pos < best_pos):
+                best, best_pos = (name, score, spec), pos
+
+        if best is None or best[1] <= self._fallback_ceiling:
+            for name, spec in self.models.items():
+                if name in matched:
+                    continue
+                score = self._score(spec, task_type, hardware, min_context, required_score)
+                if score is None or score <= 0:
+                    continue
+                pos = position[name]
+                if best is None or score > best[1] or (score == best[1] and pos < best_pos):
+                    best, best_pos = (name, score, spec), pos
+        return best
+
+    def get_top_k_models(
+        self, task_requirements: Dict[str, Any], k: int = 3
+    ) -> List[Tuple[str, float, ModelSpec]]:
+        """Best k models for a task, e.g. to pick fallbacks after the primary."""
+        task_type = task_requirements.get("type", "general")
+        hardware = task_requirements.get("hardware", "gpu").lower()
+        min_context = task_requirements.get("min_context_window", 0)
+        required_perf = task_requirements.get("min_performance", None)
+        required_score = PERF_SCORES.get(Performance(required_perf), 0) if required_perf else 0
 
-            if score > 0:
-                candidates.append((name, score, spec))
-
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        return candidates[0] if candidates else None
+        position = self._position
+        candidates = []
+        for name, spec in self.models.items():
+            score = self._score(spec, task_type, hardware, min_context, required_score)
+            if score is not None and score > 0:
+                candidates.append((name, score, spec, -position[name]))
+        # Same ordering as get_best_model_for_task: score, then registration order
+        top = heapq.nlargest(k, candidates, key=itemgetter(1, 3))
+        return [c[:3] for c in top]
 
     def get_models_by_capability(self, capability: str) -> List[ModelSpec]:
-        return [s for s in self.models.values() if capability in s.capabilities]
+        return [self.models[n] for n in self._by_capability.get(capability, ())]
 
     def get_models_by_type(self, model_type: ModelType) -> List[ModelSpec]:
-        return [s for s in self.models.values() if s.model_type == model_type]
+        return list(self._by_type.get(model_type, ()))
 
     def mark_loaded(self, name: str) -> None:
         if name in self.models:
             self.models[name].loaded = True
+            self.revision += 1
+            self._inventory_version += 1
 
     def mark_unloaded(self, name: str) -> None:
         if name in self.models:
             self.models[name].loaded = False
+            self.revision += 1
+            self._inventory_version += 1
 
     def record_usage(self, name: str, latency_ms: float) -> None:
         if name not in self.models:
@@ -205,10 +329,18 @@ class LocalModelManager:
         spec = self.models[name]
         spec.total_requests += 1
         spec.last_used = time.time()
-        prev = spec.avg_latency_ms
-        spec.avg_latency_ms = prev + (latency_ms - prev) / spec.total_requests
+        if spec.total_requests == 1:
+            spec.avg_latency_ms = latency_ms
+        else:
+            # EMA with alpha = 1/32 tracks recent latency, not lifetime history
+            spec.avg_latency_ms += (latency_ms - spec.avg_latency_ms) * 0.03125
+        self._inventory_version += 1
 
     def get_inventory(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model summary, rebuilt only after the registry or its stats change."""
+        cached = self._inventory_cache
+        if cached is not None and cached[0] == self._inventory_version:
+            return cached[1]
         result = {}
         for name, spec in self.models.items():
             result[name] = {
@@ -221,6 +353,7 @@ class LocalModelManager:
                 "avg_latency_ms": round(spec.avg_latency_ms, 2),
                 "priority": spec.priority,
             }
+        self._inventory_cache = (self._inventory_version, result)
         return result
 
     def __repr__(self) -> str:
@@ -6,14 +6,33 @@ Hardware detection, model config optimization, batch sizing,
 and real-time performance monitoring for local inference.
 """
 
+import copy
 import os
 import platform
 import time
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field
+from functools import lru_cache
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional
+from dataclasses import dataclass, field, asdict
 
+try:
+    import psutil as _psutil
+except ImportError:
+    _psutil = None
 
-@dataclass
+try:
+    import torch as _torch
+except ImportError:
+    _torch = None
+
+try:
+    import GPUtil as _gputil
+except ImportError:
+    _gputil = None
+
+
+@dataclass(slots=True)
 class GPUInfo:
     name: str = "unknown"
     memory_total_gb: float = 0.0
@@ -21,16 +40,18 @@ class GPUInfo:
     utilization_pct: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class HardwareSpecs:
     cpu_cores: int = 1
     ram_gb: float = 0.0
     gpus: List[GPUInfo] = field(default_factory=list)
     platform: str = ""
     has_cuda: bool = False
+    total_free_gb: float = 0.0  # sum of gpus[*].memory_free_gb
+    total_free_mb: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelConfig:
     dtype: str = "float16"
     device_map: str = "auto"
@@ -41,7 +62,7 @@ class ModelConfig:
     context_window: int = 4096
 
 
-@dataclass
+@dataclass(slots=True)
 class PerfSnapshot:
     timestamp: float
     cpu_pct: float
@@ -55,53 +76,71 @@ class PerfSnapshot:
     tokens_per_second: float = 0.0
 
 
+# Free-GPU-memory buckets for optimize_config: a total below _GPU_THRESHOLDS[i]
+# picks _GPU_BUCKETS[i] as (dtype, quantization, quantize_above_params_b, batch_size)
+_GPU_THRESHOLDS = (8, 16, 32)
+_GPU_BUCKETS = (
+    ("float16", "4bit", float("-inf"), 1),
+    ("float16", "8bit", 13, 2),
+    ("bfloat16", "8bit", 30, 4),
+    ("bfloat16", None, float("inf"), 8),
+)
+# Context window by free GPU memory: above _CTX_THRESHOLDS[i] picks _CTX_WINDOWS[i + 1]
+_CTX_THRESHOLDS = (12, 24)
+_CTX_WINDOWS = (4096, 8192, 32768)
+
+
 def detect_hardware() -> HardwareSpecs:
-    """Detect system hardware specifications."""
+    """Detect system hardware specifications.
+
+    The probe runs once per process (``_probe_hardware.cache_clear()`` forces
+    a new one); each caller gets its own copy to refresh independently.
+    """
+    return copy.deepcopy(_probe_hardware())
+
+
+@lru_cache(maxsize=1)
+def _probe_hardware() -> HardwareSpecs:
     specs = HardwareSpecs()
     specs.platform = platform.system()
 
-    try:
-        import psutil
-        specs.cpu_cores = psutil.cpu_count(logical=True)
-        mem = psutil.virtual_memory()
-        specs.ram_gb = round(mem.total / (1024 ** 3), 2)
-    except ImportError:
+    if _psutil is not None:
+        specs.cpu_cores = _psutil.cpu_count(logical=True)
+        mem = _psutil.virtual_memory()
+        specs.ram_gb = mem.total / (1024 ** 3)
+    else:
         specs.cpu_cores = os.cpu_count() or 1
 
     # GPU detection via nvidia-smi or torch
-    try:
-        import torch
-        if torch.cuda.is_available():
-            specs.has_cuda = True
-            for i in range(torch.cuda.device_count()):
-                props = torch.cuda.get_device_properties(i)
-                total_gb = round(props.total_mem / (1024 ** 3), 2)
-                free_gb = round(torch.cuda.mem_get_info(i)[0] / (1024 ** 3), 2)
-                specs.gpus.append(GPUInfo(
-                    name=props.name,
-                    memory_total_gb=total_gb,
-                    memory_free_gb=free_gb,
-                ))
-    except ImportError:
-        pass
-
-    # Fallback: GPUtil
-    if not specs.gpus:
-        try:
-            import GPUtil
-            for gpu in GPUtil.getGPUs():
-                specs.gpus.append(GPUInfo(
-                    name=gpu.name,
-                    memory_total_gb=round(gpu.memoryTotal / 1024, 2),
-                    memory_free_gb=round(gpu.memoryFree / 1024, 2),
-                    utilization_pct=gpu.load * 100,
-                ))
-        except ImportError:
-            pass
+    if _torch is not None and _torch.cuda.is_available():
+        specs.has_cuda = True
+        devices = [_torch.cuda.get_device_properties(i) for i in range(_torch.cuda.device_count())]
+        specs.gpus = [
+            GPUInfo(
+                name=props.name,
+                memory_total_gb=props.total_mem / (1024 ** 3),
+                memory_free_gb=_torch.cuda.mem_get_info(i)[0] / (1024 ** 3),
+            )
+            for i, props in enumerate(devices)
+        ]
+
+    # Fallback: GPUtil, only probed when torch found nothing
+    if not specs.gpus and _gputil is not None:
+        specs.gpus = [
+            GPUInfo(
+                name=gpu.name,
+                memory_total_gb=gpu.memoryTotal / 1024,
+                memory_free_gb=gpu.memoryFree / 1024,
+                utilization_pct=gpu.load * 100,
+            )
+            for gpu in _gputil.getGPUs()
+        ]
 
     if not specs.gpus:
         specs.gpus.append(GPUInfo(name="CPU-only", memory_total_gb=specs.ram_gb))
 
+    specs.total_free_gb = sum(g.memory_free_gb for g in specs.gpus)
+    specs.total_free_mb = int(specs.total_free_gb * 1024)
     return specs
 
 
@@ -111,13 +150,33 @@ class ModelPerformanceOptimizer:
     def __init__(self):
         self.hardware = detect_hardware()
         self.configs: Dict[str, ModelConfig] = {}
-        self.snapshots: List[PerfSnapshot] = []
+        # Ollama options per model; dropped when its config or GPU memory changes
+        self._ollama_cache: Dict[str, Dict[str, Any]] = {}
         self.max_snapshots = 1000
+        self.snapshots: Deque[PerfSnapshot] = deque(maxlen=self.max_snapshots)
+        if _psutil is not None:
+            # Prime the CPU counter so snapshots can sample without blocking
+            _psutil.cpu_percent(interval=None)
+
+    def refresh_gpu_mem(self) -> float:
+        """Re-sample free GPU memory and update the cached total."""
+        gpus = self.hardware.gpus
+        if self.hardware.has_cuda and _torch is not None:
+            for i, gpu in enumerate(gpus):
+                gpu.memory_free_gb = _torch.cuda.mem_get_info(i)[0] / (1024 ** 3)
+        elif _gputil is not None:
+            for gpu, sample in zip(gpus, _gputil.getGPUs()):
+                gpu.memory_free_gb = sample.memoryFree / 1024
+                gpu.utilization_pct = sample.load * 100
+        self.hardware.total_free_gb = sum(g.memory_free_gb for g in gpus)
+        self.hardware.total_free_mb = int(self.hardware.total_free_gb * 1024)
+        self._ollama_cache.clear()
+        return self.hardware.total_free_gb
 
     def optimize_config(self, model_name: str, model_params_b: float = 7.0) -> ModelConfig:
         """Generate optimized model config based on hardware."""
         cfg = ModelConfig()
-        total_gpu_mem = sum(g.memory_free_gb for g in self.hardware.gpus)
+        total_gpu_mem = self.hardware.total_free_gb
         has_gpu = self.hardware.has_cuda and total_gpu_mem > 2
 
         if not has_gpu:
@@ -125,46 +184,24 @@ class ModelPerformanceOptimizer:
             cfg.device_map = "cpu"
             cfg.quantization = "4bit" if model_params_b > 3 else None
             cfg.batch_size = 1
-        elif total_gpu_mem < 8:
-            cfg.dtype = "float16"
-            cfg.quantization = "4bit"
-            cfg.batch_size = 1
-        elif total_gpu_mem < 16:
-            cfg.dtype = "float16"
-            cfg.quantization = "8bit" if model_params_b > 13 else None
-            cfg.batch_size = 2
-        elif total_gpu_mem < 32:
-            cfg.dtype = "bfloat16"
-            cfg.quantization = "8bit" if model_params_b > 30 else None
-            cfg.batch_size = 4
         else:
-            cfg.dtype = "bfloat16"
-            cfg.quantization = None
-            cfg.batch_size = 8
+            dtype, quant, quant_above, batch = _GPU_BUCKETS[bisect_right(_GPU_THRESHOLDS, total_gpu_mem)]
+            cfg.dtype = dtype
+            cfg.quantization = quant if model_params_b > quant_above else None
+            cfg.batch_size = batch
 
         # Context window based on memory
-        if total_gpu_mem > 24:
-            cfg.context_window = 32768
-            cfg.max_seq_length = 32768
-        elif total_gpu_mem > 12:
-            cfg.context_window = 8192
-            cfg.max_seq_length = 8192
-        else:
-            cfg.context_window = 4096
-            cfg.max_seq_length = 4096
+        cfg.context_window = cfg.max_seq_length = _CTX_WINDOWS[bisect_left(_CTX_THRESHOLDS, total_gpu_mem)]
 
         self.configs[model_name] = cfg
+        self._ollama_cache.pop(model_name, None)
         return cfg
 
     def get_batch_recommendation(self, model_name: str, seq_length: int) -> int:
         """Recommend batch size for given sequence length."""
-        total_gpu = sum(g.memory_free_gb for g in self.hardware.gpus)
-        if total_gpu <= 0:
-            return 1
-
-        mem_per_sample_gb = seq_length * 0.00001  # rough estimate
-        max_batch = max(1, int(total_gpu / max(mem_per_sample_gb, 0.1)))
-        return min(max_batch, 32)
+        # Rough estimate: ~0.01 MB per token, at least 100 MB per sample
+        mem_per_sample_mb = max(seq_length // 100, 100)
+        return max(1, min(32, self.hardware.total_free_mb // mem_per_sample_mb))
 
     def take_snapshot(self, model_name: str = "") -> PerfSnapshot:
         """Capture current performance snapshot."""
@@ -172,26 +209,19 @@ class ModelPerformanceOptimizer:
         ram_used = 0.0
         ram_total = self.hardware.ram_gb
 
-        try:
-            import psutil
-            cpu_pct = psutil.cpu_percent(interval=0.1)
-            mem = psutil.virtual_memory()
-            ram_used = round(mem.used / (1024 ** 3), 2)
-            ram_total = round(mem.total / (1024 ** 3), 2)
-        except ImportError:
-            pass
+        if _psutil is not None:
+            cpu_pct = _psutil.cpu_percent(interval=None)
+            mem = _psutil.virtual_memory()
+            ram_used = mem.used / (1024 ** 3)
+            ram_total = mem.total / (1024 ** 3)
 
         gpu_util = 0.0
         gpu_mem_used = 0.0
         gpu_mem_total = 0.0
 
-        try:
-            import torch
-            if torch.cuda.is_available():
-                gpu_mem_used = round(torch.cuda.memory_allocated() / (1024 ** 3), 2)
-                gpu_mem_total = sum(g.memory_total_gb for g in self.hardware.gpus)
-        except ImportError:
-            pass
+        if _torch is not None and _torch.cuda.is_available():
+            gpu_mem_used = _torch.cuda.memory_allocated() / (1024 ** 3)
+            gpu_mem_total = sum(g.memory_total_gb for g in self.hardware.gpus)
 
         snap = PerfSnapshot(
             timestamp=time.time(),
@@ -205,15 +235,16 @@ class ModelPerformanceOptimizer:
         )
 
         self.snapshots.append(snap)
-        if len(self.snapshots) > self.max_snapshots:
-            self.snapshots = self.snapshots[-self.max_snapshots:]
-
         return snap
 
     def get_ollama_config(self, model_name: str) -> Dict[str, Any]:
         """Generate Ollama-specific runtime config."""
+        cached = self._ollama_cache.get(model_name)
+        if cached is not None:
+            return dict(cached)  # callers may extend their copy
+
         cfg = self.configs.get(model_name) or self.optimize_config(model_name)
-        total_gpu = sum(g.memory_free_gb for g in self.hardware.gpus)
+        total_gpu = self.hardware.total_free_gb
 
         ollama_opts: Dict[str, Any] = {
             "num_ctx": cfg.context_window,
@@ -228,7 +259,8 @@ class ModelPerformanceOptimizer:
         else:
             ollama_opts["num_gpu"] = 0  # CPU only
 
-        return ollama_opts
+        self._ollama_cache[model_name] = ollama_opts
+        return dict(ollama_opts)
 
     def get_summary(self) -> Dict[str, Any]:
         """Get optimizer summary."""
@@ -236,13 +268,17 @@ class ModelPerformanceOptimizer:
             "hardware": {
                 "platform": self.hardware.platform,
                 "cpu_cores": self.hardware.cpu_cores,
-                "ram_gb": self.hardware.ram_gb,
+                "ram_gb": round(self.hardware.ram_gb, 2),
                 "has_cuda": self.hardware.has_cuda,
                 "gpus": [
-                    {"name": g.name, "total_gb": g.memory_total_gb, "free_gb": g.memory_free_gb}
+                    {
+                        "name": g.name,
+                        "total_gb": round(g.memory_total_gb, 2),
+                        "free_gb": round(g.memory_free_gb, 2),
+                    }
                     for g in self.hardware.gpus
                 ],
             },
-            "configs": {k: vars(v) for k, v in self.configs.items()},
+            "configs": {k: asdict(v) for k, v in self.configs.items()},
             "snapshots_count": len(self.snapshots),
         }
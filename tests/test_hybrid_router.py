@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from models.hybrid_router import HybridModelRouter, RoutingResult
+
+
+def make_router(latency_ms=100.0, delay=0.0):
+    """Router with a stubbed local call; latency_ms may be a callable(endpoint)."""
+    router = HybridModelRouter()
+    router.calls = []
+
+    async def fake_execute_local(endpoint, prompt, req):
+        router.calls.append((endpoint.name, prompt))
+        await asyncio.sleep(delay)
+        latency = latency_ms(endpoint) if callable(latency_ms) else latency_ms
+        return RoutingResult(
+            success=True, provider="local", model=endpoint.model_id,
+            response=prompt, latency_ms=latency,
+        )
+
+    router._execute_local = fake_execute_local
+    return router
+
+
+def only_available(router, *names):
+    for name, ep in router.endpoints.items():
+        ep.is_available = name in names
+        ep.avg_latency_initialized = name in names
+
+
+def test_gradual_latency_drift_reranks_endpoints():
+    # Each phi3 sample is 1.5x its current average, so every EMA step moves it
+    # by only 6.25%, yet it ends up far slower than the alternative
+    router = make_router(lambda ep: ep.avg_latency_ms * (1.5 if ep.name == "phi3" else 1.0))
+    only_available(router, "phi3", "mistral-7b")
+    fast, steady = router.endpoints["phi3"], router.endpoints["mistral-7b"]
+    fast.avg_latency_ms, steady.avg_latency_ms = 190.0, 200.0
+    assert router.select_endpoint({}) is fast
+
+    async def run():
+        for i in range(10):
+            await router.route_request(f"p{i}", {"no_cache": True})
+
+    asyncio.run(run())
+    assert fast.avg_latency_ms > steady.avg_latency_ms
+    assert router.select_endpoint({}) is steady
+
+
+def test_concurrent_duplicates_share_one_call():
+    router = make_router(delay=0.01)
+
+    async def run():
+        return await asyncio.gather(*(router.route_request("same", {}) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(router.calls) == 1
+    assert [r.cached for r in results].count(False) == 1
+    assert all(r.success and r.response == "same" for r in results)
+    assert router._inflight == {}
+
+
+def test_cancelling_first_caller_does_not_cancel_joiners():
+    router = make_router(delay=0.05)
+
+    async def run():
+        first = asyncio.create_task(router.route_request("same", {}))
+        await asyncio.sleep(0)
+        joiners = [asyncio.create_task(router.route_request("same", {})) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await asyncio.gather(first, *joiners, return_exceptions=True)
+
+    first, *joined = asyncio.run(run())
+    assert isinstance(first, asyncio.CancelledError)
+    assert all(isinstance(r, RoutingResult) and r.success for r in joined)
+    assert len(router.calls) == 1
+    # The shared call still recorded its metrics and cached its result
+    assert len(router.response_cache) == 1
+
+
+def test_cached_result_expires_after_ttl():
+    router = make_router()
+
+    async def run():
+        await router.route_request("p", {})
+        hit = await router.route_request("p", {})
+        router.cache_ttl = 0
+        miss = await router.route_request("p", {})
+        return hit, miss
+
+    hit, miss = asyncio.run(run())
+    assert hit.cached and not miss.cached
+    assert len(router.calls) == 2
+
+
+def test_cache_evicts_least_recently_used():
+    router = make_router()
+    router.cache_max_entries = 2
+
+    async def run():
+        await router.route_request("a", {})
+        await router.route_request("b", {})
+        await router.route_request("a", {})  # hit; "b" is now least recent
+        await router.route_request("c", {})  # evicts "b"
+        await router.route_request("a", {})
+        await router.route_request("b", {})
+
+    asyncio.run(run())
+    assert [prompt for _, prompt in router.calls] == ["a", "b", "c", "b"]
+    assert len(router.response_cache) == 2
+
+
+def test_session_is_replaced_when_the_event_loop_changes():
+    pytest.importorskip("aiohttp")
+    router = HybridModelRouter()
+
+    async def get_session():
+        return await router._get_session()
+
+    first = asyncio.run(get_session())
+    second = asyncio.run(get_session())
+    assert second is not first
+    assert first.closed  # released, not left open on the dead loop
+
+    async def close():
+        await router.close()
+
+    asyncio.run(close())
+    assert second.closed and router._session is None
@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+from models.local_model_manager import LocalModelManager, ModelType, Performance
+
+CAPS = ["reasoning", "coding", "qa", "chat", "text_generation", "embedding", "vision"]
+PERF = {Performance.ULTRA: 4, Performance.HIGH: 3, Performance.MEDIUM: 2, Performance.LOW: 1}
+
+
+def reference_best(manager, req):
+    """The original full scan: score every model, stable sort, take the first."""
+    task_type = req.get("type", "general")
+    hardware = req.get("hardware", "gpu").lower()
+    min_context = req.get("min_context_window", 0)
+    required_perf = req.get("min_performance")
+    candidates = []
+    for name, spec in manager.models.items():
+        score = 0.0
+        if task_type in spec.capabilities:
+            score += 3.0
+        elif task_type == "general" and "text_generation" in spec.capabilities:
+            score += 2.0
+        if hardware in spec.hardware_req.lower():
+            score += 2.0
+        score += PERF[spec.performance] * 0.5
+        if spec.context_window >= min_context:
+            score += 1.0
+        elif min_context > 0:
+            continue
+        score += spec.priority * 0.01
+        if spec.loaded:
+            score += 1.5
+        if required_perf and PERF[spec.performance] < PERF[Performance(required_perf)]:
+            continue
+        if score > 0:
+            candidates.append((name, score))
+    candidates.sort(key=lambda c: c[1], reverse=True)
+    return candidates[0] if candidates else None
+
+
+def random_registry(rng):
+    return {
+        f"m{i}": {
+            "model_type": ModelType.LANGUAGE,
+            "capabilities": rng.sample(CAPS, rng.randint(0, 3)),
+            "hardware_req": rng.choice(["GPU 8GB+", "CPU", "GPU 4GB+"]),
+            "performance": rng.choice(list(Performance)),
+            "use_case": "test",
+            "context_window": rng.choice([4096, 8192, 32768]),
+            # Repeated priorities make exact score ties common
+            "priority": rng.choice([0, 50, 50, 100]),
+        }
+        for i in range(rng.randint(1, 8))
+    }
+
+
+def random_requirements(rng):
+    req = {
+        "type": rng.choice(CAPS + ["general"]),
+        "hardware": rng.choice(["gpu", "cpu"]),
+        "min_context_window": rng.choice([0, 8000, 20000]),
+    }
+    if rng.random() < 0.3:
+        req["min_performance"] = rng.choice([p.value for p in Performance])
+    return req
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_selection_matches_sorted_full_scan(seed):
+    rng = random.Random(seed)
+    for _ in range(20):
+        manager = LocalModelManager(random_registry(rng))
+        for name in manager.models:
+            if rng.random() < 0.3:
+                manager.mark_loaded(name)
+        for _ in range(20):
+            req = random_requirements(rng)
+            best = manager.get_best_model_for_task(req)
+            assert (best and best[:2]) == reference_best(manager, req), req
+
+
+def test_default_registry_selection_matches_sorted_full_scan():
+    manager = LocalModelManager()
+    for task_type in CAPS + ["general", "summarization", "embedding"]:
+        for hardware in ("gpu", "cpu"):
+            for min_context in (0, 32768, 200000):
+                req = {"type": task_type, "hardware": hardware, "min_context_window": min_context}
+                best = manager.get_best_model_for_task(req)
+                assert (best and best[:2]) == reference_best(manager, req), req
+
+
+def test_memoized_selection_follows_load_state():
+    manager = LocalModelManager()
+    req = {"type": "chat", "hardware": "gpu"}
+    assert manager.get_best_model_for_task(req)[:2] == reference_best(manager, req)
+    for name in manager.models:
+        manager.mark_loaded(name)
+        assert manager.get_best_model_for_task(req)[:2] == reference_best(manager, req)
+        manager.mark_unloaded(name)
+
+
+def test_top_k_starts_with_best():
+    rng = random.Random(7)
+    for _ in range(50):
+        manager = LocalModelManager(random_registry(rng))
+        req = random_requirements(rng)
+        top = manager.get_top_k_models(req, k=3)
+        best = manager.get_best_model_for_task(req)
+        assert (top[0][:2] if top else None) == (best and best[:2])
+        assert [c[1] for c in top] == sorted((c[1] for c in top), reverse=True)
@@ -0,0 +1,53 @@
+import asyncio
+
+from core.orchestrator import AgentDescriptor, AgentState, OrchestratorEngine, TaskEnvelope
+
+
+async def run_engine(engine, expected, timeout=3.0):
+    await engine.start()
+    deadline = asyncio.get_running_loop().time() + timeout
+    while len(engine.results) < expected and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.01)
+    await engine.stop()
+
+
+def test_same_priority_tasks_dispatch_in_submission_order():
+    order = []
+
+    async def handler(payload):
+        order.append(payload["i"])
+        await asyncio.sleep(0)
+
+    async def run():
+        engine = OrchestratorEngine({"handlers": {"a0": handler}})
+        engine.register_agent(AgentDescriptor("a0", ["x"]))
+        for i in range(40):
+            await engine.submit_task(TaskEnvelope(task_id=str(i), payload={"i": i}))
+        await run_engine(engine, 40)
+        return engine
+
+    engine = asyncio.run(run())
+    assert order == list(range(40))
+    assert not engine._task_handles
+
+
+def test_agent_set_idle_directly_is_dispatched():
+    async def run():
+        engine = OrchestratorEngine()
+        agent = AgentDescriptor("a0", ["x"], state=AgentState.SCALING)
+        engine.register_agent(agent)
+        agent.state = AgentState.IDLE  # bypasses set_agent_state
+        await engine.submit_task(TaskEnvelope(task_id="t", payload={}))
+        await run_engine(engine, 1)
+        return engine
+
+    engine = asyncio.run(run())
+    assert engine.results["t"]["status"] == "ok"
+
+
+def test_set_agent_state_updates_idle_index():
+    engine = OrchestratorEngine()
+    engine.register_agent(AgentDescriptor("a0", ["x"], state=AgentState.FAILED))
+    assert engine._idle_agents() == []
+    engine.set_agent_state("a0", AgentState.IDLE)
+    assert engine._idle_agents() == ["a0"]
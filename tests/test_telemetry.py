@@ -0,0 +1,46 @@
+import math
+import random
+
+import pytest
+
+from core.telemetry import MetricSeries, MetricType
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_series_matches_naive_list_across_wraparound(seed):
+    rng = random.Random(seed)
+    retention = 8
+    series = MetricSeries("m", MetricType.GAUGE, retention=retention)
+    naive = []  # (timestamp, value)
+    ts = 0.0
+    for _ in range(retention * 4 + 3):
+        ts += rng.choice((0.0, 0.5, 1.0))  # repeated timestamps included
+        value = rng.choice((rng.randint(-5, 5), rng.uniform(-5, 5)))
+        series.append(value, ts)
+        naive = (naive + [(ts, float(value))])[-retention:]
+        values = [v for _, v in naive]
+
+        assert len(series) == len(naive)
+        assert series.latest == values[-1]
+        assert series.min_val == min(values)
+        assert series.max_val == max(values)
+        assert math.isclose(series.avg, sum(values) / len(values), abs_tol=1e-9)
+        assert [p.value for p in series.points] == values
+        for cutoff in {t for t, _ in naive} | {naive[0][0] - 1, ts + 1}:
+            assert list(series.recent(cutoff)) == [v for t, v in naive if t >= cutoff]
+
+
+def test_series_reports_floats_for_int_writes():
+    series = MetricSeries("m", MetricType.COUNTER, retention=4)
+    for v in (3, 1, 2):
+        series.append(v, 1.0)
+    for stat in (series.latest, series.min_val, series.max_val, series.avg):
+        assert type(stat) is float
+
+
+def test_point_labels_follow_eviction():
+    series = MetricSeries("m", MetricType.GAUGE, retention=2)
+    series.append(1, 1.0, {"a": "1"})
+    series.append(2, 2.0)
+    series.append(3, 3.0, {"c": "3"})
+    assert [p.labels for p in series.points] == [{}, {"c": "3"}]